@@ -0,0 +1,181 @@
+"""
+Texts for :mod:`benchmarks.suite`. Corpora are generated with a fixed seed,
+so every run processes the same text.
+"""
+
+import ast
+import doctest
+import random
+import re
+from typing import Dict, List
+
+from typus.processors import EnRuExpressions
+
+TITLES = (
+    'Winnie-the-Pooh',
+    '"Pooh\'s" honey -- 50% off',
+    'Size 10-15 mm',
+    'Он сказал "привет"',
+    '(c) 2018 Disney',
+    'Price: 1000 р.',
+    'Chapter 1/2 ... the end',
+)
+
+EN_SENTENCES = (
+    '"I don\'t feel very much like Pooh today," said Pooh.',
+    '"There there," said Piglet. "I\'ll bring you tea and honey."',
+    'It\'s a 3-5 minutes walk -- no more than 500 m from here.',
+    'He said "\'Winnie-the-Pooh\' is my favorite book!"',
+    'The 90\'s were great... weren\'t they?',
+    'Owl wrote (c) 1926 and (tm) on every page - twice.',
+)
+
+RU_SENTENCES = (
+    'Он сказал: "\'Винни-Пух\' -- моя любимая книга!".',
+    'Пятачок принёс 2 кг мёда и 1/2 л молока за 300 руб.',
+    'Кролик, как следует из вышесказанного, - занятой зверь.',
+    '"Что это?" - спросил Пух. "Это - хвост", - ответил Иа.',
+    'В 1926 г. книга вышла тиражом 10 000 экз. (с) Милн',
+)
+
+TECHNICAL = (
+    'Range 1-2, 1.5-2.5, -3-5 and 10-15 mm.',
+    '3 x 3 = 9, 3 * 4 = 12, 2 - 1 = 1, +-2 mm, 5 <= 6 >= 4 /= 3.',
+    'Battery 1500 mA*h, 220 V, 50 Hz, 1/2 1/4 3/4 7/8.',
+    'Screen 5\' 11", 1920x1080 px, 300 dpi, 12 m 30 cm.',
+    'Price 1 000 000 р., 25 руб., 99.99 $ and 10 % discount.',
+)
+
+
+def _text(sentences, size: int, seed: int = 0) -> str:
+    rand = random.Random(seed)
+    paragraphs = []
+    length = 0
+    while length < size:
+        paragraph = ' '.join(
+            rand.choice(sentences) for _ in range(rand.randint(2, 8)))
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
+
+
+def _html(tags: int) -> str:
+    row = ('<p class="x">He said "<b>hi</b>" <a href="/y">(c)</a> '
+           '<code>a--b</code></p>\n')
+    return row * (tags // 8)
+
+
+def _nested_quotes(depth: int, count: int) -> str:
+    quotes = '"\'' * (depth // 2)
+    opening = ' '.join(quotes)
+    block = '{0} deep {1}.'.format(opening, quotes[::-1])
+    return '\n'.join([block] * count)
+
+
+def _adversarial() -> str:
+    return '\n\n'.join((
+        # Stray quotes which never close
+        ' '.join('"foo \'bar' for _ in range(500)),
+        # Dashes and spaces the mdash rule looks around
+        'foo ' + ' - ' * 1000 + 'bar',
+        ' '.join('word' for _ in range(2000)) + ' -- end',
+        # Brackets which never close
+        '< a ' * 1000,
+        # Digits and dots
+        '1.2.3-4-5 ' * 500,
+    ))
+
+
+def get_crafted(size: int) -> Dict[str, str]:
+    """
+    Returns texts of the given size crafted to make patterns backtrack:
+    runs of words, spaces and dashes, quotes and brackets which
+    never close.
+    """
+
+    return {
+        'words_before_dash': 'word ' * (size // 5) + '-- end',
+        'dashes': 'foo' + ' - ' * (size // 3) + '1',
+        'nbsp_run': 'foo' + '\xa0' * size + '- bar.',
+        'stray_quotes': '"foo \'bar ' * (size // 10),
+        'unclosed_tags': '<a ' * (size // 3),
+        'unclosed_comments': '<!--' * (size // 4) + '<b>',
+    }
+
+
+def get_corpora(size: int = 2 ** 17) -> Dict[str, List[str]]:
+    """
+    Returns corpora names and texts to process one by one.
+    """
+
+    return {
+        'titles': list(TITLES) * 100,
+        'prose_en': [_text(EN_SENTENCES, size)],
+        'prose_ru': [_text(RU_SENTENCES, size)],
+        'html': [_html(10000)],
+        'nested_quotes': [_nested_quotes(20, 100)],
+        'technical': [_text(TECHNICAL, size // 4)],
+        'adversarial': [_adversarial()],
+    }
+
+
+def _doctest_sources(doc: str) -> List[str]:
+    # Texts passed to typus in the doctests
+    sources = []
+    for example in doctest.DocTestParser().get_examples(doc or ''):
+        for node in ast.walk(ast.parse(example.source)):
+            if isinstance(node, ast.Call) and node.args:
+                try:
+                    value = ast.literal_eval(node.args[0])
+                except ValueError:
+                    continue
+                if isinstance(value, str):
+                    sources.append(value)
+    return sources
+
+
+def _doc_map_sources(doc: str) -> List[str]:
+    # Left column of the :func:`typus.utils.doc_map` table of examples
+    if ':header: "Before"' not in (doc or ''):
+        return []
+    return re.findall(r'^\t``(.*?)`` \|', doc, re.M)
+
+
+def get_summary_sources() -> Dict[str, List[str]]:
+    """
+    Returns cases of :mod:`tests.test_summary` grouped by test name.
+    """
+
+    try:
+        from tests import test_summary
+    except ImportError:  # pragma: nocover
+        return {}
+
+    sources = {}
+    for name in dir(test_summary):
+        func = getattr(test_summary, name)
+        for mark in getattr(func, 'pytestmark', ()):
+            if mark.name == 'parametrize' and mark.args[0].startswith(
+                    'source'):
+                sources.setdefault(name[len('test_'):], []).extend(
+                    case[0] for case in mark.args[1])
+    return sources
+
+
+def get_rule_samples() -> Dict[str, List[str]]:
+    """
+    Returns inputs of every expression of
+    :class:`typus.processors.EnRuExpressions`: sources of doctests,
+    ``doc_map`` tables and :mod:`tests.test_summary` cases of the same name.
+    Expressions without examples get :data:`TECHNICAL` and prose.
+    """
+
+    summary = get_summary_sources()
+    default = list(TECHNICAL + EN_SENTENCES + RU_SENTENCES)
+    samples = {}
+    for name in EnRuExpressions.expressions:
+        doc = getattr(EnRuExpressions, 'expr_' + name).__doc__
+        samples[name] = (
+            _doctest_sources(doc) + _doc_map_sources(doc)
+            + summary.get(name, [])) or default
+    return samples
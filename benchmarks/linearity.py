@@ -0,0 +1,67 @@
+"""
+Checks that processing time grows linearly with the text size
+on :func:`benchmarks.corpora.get_crafted` texts from 1 KB to 10 MB.
+Exits with 1 if time grows faster than ``size ** max-exponent``.
+
+Usage::
+
+    $ python -m benchmarks.linearity
+    $ python -m benchmarks.linearity --max-size 1048576 --lang ru
+"""
+
+import argparse
+import math
+import sys
+import time
+
+from typus import en_typus, ru_typus
+
+from .corpora import get_crafted
+from .scaling import get_runtime
+
+
+def measure(typus, text):
+    start = time.perf_counter()
+    typus(text)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--min-size', type=int, default=2 ** 10)
+    parser.add_argument('--max-size', type=int, default=10 * 2 ** 20)
+    parser.add_argument('--lang', choices=('en', 'ru'), default='en')
+    parser.add_argument(
+        '--max-exponent', type=float, default=1.3,
+        help='fails if time grows faster, 1 is linear, 2 is quadratic')
+    args = parser.parse_args(argv)
+
+    typus = en_typus if args.lang == 'en' else ru_typus
+    sizes = [args.min_size]
+    while sizes[-1] * 4 <= args.max_size:
+        sizes.append(sizes[-1] * 4)
+    if sizes[-1] < args.max_size:
+        sizes.append(args.max_size)
+
+    print(get_runtime())
+    typus('warm up')
+    failed = []
+    for name in get_crafted(args.min_size):
+        times = [measure(typus, get_crafted(size)[name]) for size in sizes]
+
+        # Small texts are too fast to measure, the largest half counts
+        half = len(sizes) // 2
+        exponent = math.log(times[-1] / times[half]) / math.log(
+            sizes[-1] / sizes[half])
+        if exponent > args.max_exponent:
+            failed.append(name)
+        print('{0:20} {1}  exponent {2:.2f}'.format(
+            name, ' '.join('{0:8.3f}s'.format(x) for x in times), exponent))
+
+    if failed:
+        print('Not linear: ' + ', '.join(failed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
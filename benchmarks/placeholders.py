@@ -0,0 +1,69 @@
+"""
+Compares escape keys of :class:`typus.processors.EscapeHtml` with
+the legacy ``{#htmlN#}`` placeholders restored by a replace per tag.
+
+Usage::
+
+    $ python -m benchmarks.placeholders --tags 1000 10000 100000
+"""
+
+import argparse
+import time
+
+from typus import EnTypus
+from typus.processors import EscapeHtml
+
+SAMPLE = '<p class="x">Hello <a href="/y">"world"</a> (c) <b>1--2</b></p>\n'
+
+
+class LegacyEscapeHtml(EscapeHtml):
+    placeholder = '{{#html{0}#}}'
+
+    def _key(self, index: int) -> str:
+        return self.placeholder.format(index)
+
+    def _restore_values(self, text, storage, offsets=None):
+        for key, value in reversed(storage):
+            text = text.replace(key, value)
+        return text
+
+
+class LegacyTypus(EnTypus):
+    processors = tuple(
+        LegacyEscapeHtml if processor is EscapeHtml else processor
+        for processor in EnTypus.processors)
+
+
+def get_html(tags: int) -> str:
+    # Every sample has six tags
+    return SAMPLE * (tags // 6)
+
+
+def bench(typus, html, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        typus(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--tags', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    current, legacy = EnTypus(), LegacyTypus()
+    for tags in args.tags:
+        html = get_html(tags)
+        assert current(html) == legacy(html)
+        old = bench(legacy, html, args.repeat)
+        new = bench(current, html, args.repeat)
+        print('{0} tags: legacy {1:.3f}s, keys {2:.3f}s, speedup {3:.1f}'
+              .format(tags, old, new, old / new))
+
+
+if __name__ == '__main__':
+    main()
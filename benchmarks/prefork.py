@@ -0,0 +1,76 @@
+"""
+Measures what :func:`typus.warmup` saves pre-fork workers: private memory
+of every worker after its first request and the first request latency.
+Forks workers like gunicorn does, so Linux is required.
+
+Usage::
+
+    $ python -m benchmarks.prefork --workers 4
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Runs the master, forks workers and prints their reports
+MASTER = '''
+import gc, json, os, sys, time
+import typus
+from benchmarks.prefork import private_memory
+if {warmup}:
+    typus.warmup()
+reports = []
+for _ in range({workers}):
+    read, write = os.pipe()
+    if not os.fork():
+        start = time.perf_counter()
+        typus.en_typus('<p>"Pooh" -- (c) 2018</p>')
+        typus.ru_typus('<p>"Пух" -- (c) 2018</p>')
+        latency = time.perf_counter() - start
+        gc.collect()  # happens in workers sooner or later
+        os.write(write, json.dumps([latency, private_memory()]).encode())
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as pipe:
+        reports.append(json.loads(pipe.read()))
+    os.wait()
+print(json.dumps(reports))
+'''
+
+
+def private_memory() -> int:
+    """
+    Returns memory the process doesn't share with others in bytes.
+    """
+
+    with open('/proc/self/smaps_rollup') as smaps:
+        return sum(
+            int(line.split()[1]) * 1024 for line in smaps
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')))
+
+
+def run_master(warmup: bool, workers: int) -> list:
+    output = subprocess.check_output(
+        (sys.executable, '-c', MASTER.format(warmup=warmup, workers=workers)),
+        universal_newlines=True)
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    for warmup in (False, True):
+        reports = run_master(warmup, args.workers)
+        latency = statistics.median(x for x, _ in reports) * 1000
+        memory = statistics.median(x for _, x in reports) / 2 ** 20
+        print('warmup {0}: first request {1:.2f}ms, '
+              'private memory {2:.2f} MB per worker'.format(
+                  'on' if warmup else 'off', latency, memory))
+
+
+if __name__ == '__main__':
+    main()
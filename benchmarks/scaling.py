@@ -0,0 +1,82 @@
+"""
+Measures how :class:`typus.pool.TypusPool` scales with the number of workers.
+
+Usage::
+
+    $ python -m benchmarks.scaling --records 20000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import sysconfig
+import time
+
+from typus import en_typus, ru_typus
+from typus.pool import TypusPool
+
+SAMPLES = (
+    '"I don\'t feel very much like Pooh today..." said Pooh.',
+    '"There there," said Piglet. "I\'ll bring you tea and honey."',
+    'Size 10-15 mm, 1/2 price - only 1000 р. (c) 2018',
+    '<p>He said "\'Winnie-the-Pooh\' is my favorite book!"</p>',
+    'Он сказал: "\'Винни-Пух\' -- моя любимая книга!".',
+)
+
+
+def get_records(count: int, seed: int = 0):
+    rand = random.Random(seed)
+    return [
+        ' '.join(rand.choice(SAMPLES) for _ in range(rand.randint(1, 20)))
+        + ' #{0}'.format(i)  # makes them unique
+        for i in range(count)
+    ]
+
+
+def get_runtime():
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    free_threaded = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+    return 'Python {0}, free-threaded build: {1}, GIL enabled: {2}'.format(
+        sys.version.split()[0], free_threaded, gil)
+
+
+def bench(typus, records, executor, workers):
+    with TypusPool(typus, executor=executor, workers=workers) as pool:
+        pool.map(records[:workers])  # starts workers
+        start = time.perf_counter()
+        pool.map(records)
+        return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--records', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--lang', choices=('en', 'ru'), default='en')
+    parser.add_argument(
+        '--executors', nargs='+', default=list(TypusPool.executors))
+    args = parser.parse_args(argv)
+
+    typus = en_typus if args.lang == 'en' else ru_typus
+    records = get_records(args.records)
+    size = sum(map(len, records)) / 2 ** 20
+
+    print(get_runtime())
+    start = time.perf_counter()
+    typus.map(records)
+    serial = time.perf_counter() - start
+    print('serial: {0:.2f}s, {1:.2f} MB/s'.format(serial, size / serial))
+
+    for executor in args.executors:
+        if TypusPool.executors[executor] is None:
+            print('{0}: not supported'.format(executor))
+            continue
+        for workers in range(1, args.workers + 1):
+            elapsed = bench(typus, records, executor, workers)
+            print('{0} x {1}: {2:.2f}s, {3:.2f} MB/s, speedup {4:.2f}'.format(
+                executor, workers, elapsed, size / elapsed, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main()
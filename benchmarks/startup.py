@@ -0,0 +1,76 @@
+"""
+Measures ``import typus`` time and the first call latency in fresh
+interpreters. Exits with an error if the median is over the budget.
+Default budgets are close to the measured ones, so regressions fail tox.
+
+Usage::
+
+    $ python -m benchmarks.startup --runs 10 --import-budget 40
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Prints microseconds the first call takes
+FIRST_CALL = '''
+import time
+from typus import {0}_typus as typus
+start = time.perf_counter()
+typus('"I don\\'t feel very much like Pooh today..." said Pooh. (c) 2018')
+print(int((time.perf_counter() - start) * 1e6))
+'''
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        (sys.executable, ) + args, check=True, universal_newlines=True,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def import_time() -> int:
+    """
+    Returns cumulative ``import typus`` time in microseconds
+    reported by ``-X importtime``.
+    """
+
+    stderr = run('-X', 'importtime', '-c', 'import typus').stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == 'typus':
+            return int(cumulative)
+    raise RuntimeError('No typus in the import time report.')
+
+
+def first_call(lang: str) -> int:
+    return int(run('-c', FIRST_CALL.format(lang)).stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--lang', choices=('en', 'ru'), default='en')
+    parser.add_argument(
+        '--import-budget', type=float, default=40, help='milliseconds')
+    parser.add_argument(
+        '--call-budget', type=float, default=50, help='milliseconds')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, measure, budget in (
+            ('import', import_time, args.import_budget),
+            ('first call', lambda: first_call(args.lang), args.call_budget)):
+        median = statistics.median(
+            measure() for _ in range(args.runs)) / 1000
+        over = median > budget
+        failed |= over
+        print('{0}: {1:.1f}ms, budget {2:.0f}ms{3}'.format(
+            name, median, budget, ', over budget!' if over else ''))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
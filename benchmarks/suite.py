@@ -0,0 +1,180 @@
+"""
+Benchmark suite: per-call latency, throughput and peak memory of
+``en_typus``, ``ru_typus`` and every processor alone on the corpora of
+:mod:`benchmarks.corpora`, plus every expression alone on its examples.
+Results are saved as a baseline to compare with after upgrades.
+
+Usage::
+
+    $ python -m benchmarks.suite run --save baseline.json
+    $ python -m benchmarks.suite run --only rule --save new.json
+    $ python -m benchmarks.suite compare baseline.json new.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from itertools import chain
+
+from typus import TypusCore, en_typus, ru_typus
+from typus.processors import (
+    EnQuotes,
+    EnRuExpressions,
+    EscapeHtml,
+    EscapePhrases,
+    RuQuotes,
+)
+
+from .corpora import get_corpora, get_rule_samples, get_summary_sources
+from .scaling import get_runtime
+
+PHRASES = ('Winnie-the-Pooh', 'Пятачок')
+
+
+def alone(processor):
+    class Typus(TypusCore):
+        processors = (processor, )
+    return Typus()
+
+
+def get_targets():
+    """
+    Returns names, typus instances, call arguments and corpora to skip.
+    """
+
+    targets = [
+        ('en_typus', en_typus, {}, ()),
+        ('ru_typus', ru_typus, {}, ()),
+        ('EscapePhrases', alone(EscapePhrases),
+         {'escape_phrases': PHRASES}, ()),
+    ]
+    targets.extend(
+        (processor.__name__, alone(processor), {}, ())
+        for processor in (EscapeHtml, EnQuotes, RuQuotes))
+
+    # Expressions never get raw markup, it's escaped before them
+    targets.append(
+        ('EnRuExpressions', alone(EnRuExpressions), {}, ('html', )))
+    return targets
+
+
+def get_rules():
+    for name, samples in get_rule_samples().items():
+        expressions = type(name, (EnRuExpressions, ), {
+            'expressions': (name, ),
+        })
+        yield 'rule/' + name, alone(expressions), samples
+
+
+def measure(typus, texts, kwargs, repeat):
+    """
+    Returns the best per-call latency in microseconds, throughput in MB/s
+    and peak memory in KB.
+    """
+
+    size = sum(len(text.encode()) for text in texts) / 2 ** 20
+    typus(texts[0], **kwargs)  # builds processors
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            typus(text, **kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    # Tracing slows the code down, so it has a separate run
+    tracemalloc.start()
+    for text in texts:
+        typus(text, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'latency_us': best / len(texts) * 1e6,
+        'mbps': size / best,
+        'peak_kb': peak / 1024,
+    }
+
+
+def run(args):
+    corpora = get_corpora()
+    corpora['summary'] = list(chain(*get_summary_sources().values()))
+
+    cases = [
+        ('{0}/{1}'.format(name, corpus), typus, texts, kwargs)
+        for name, typus, kwargs, skip in get_targets()
+        for corpus, texts in corpora.items() if corpus not in skip
+    ]
+    cases.extend((name, typus, samples, {})
+                 for name, typus, samples in get_rules())
+
+    results = {}
+    print(get_runtime())
+    for name, typus, texts, kwargs in cases:
+        if args.only and not any(x in name for x in args.only):
+            continue
+        result = results[name] = measure(typus, texts, kwargs, args.repeat)
+        print('{0:40} {1:12.1f}us {2:8.2f} MB/s {3:10.1f} KB'.format(
+            name, result['latency_us'], result['mbps'], result['peak_kb']))
+
+    if args.save:
+        with open(args.save, 'w') as output:
+            json.dump({'runtime': get_runtime(), 'results': results},
+                      output, indent=2, sort_keys=True)
+
+
+def compare(args):
+    with open(args.baseline) as baseline, open(args.current) as current:
+        old, new = json.load(baseline), json.load(current)
+
+    print('baseline:', old['runtime'])
+    print('current: ', new['runtime'])
+    regressions = []
+    for name, result in sorted(new['results'].items()):
+        try:
+            before = old['results'][name]
+        except KeyError:
+            continue
+        change = result['latency_us'] / before['latency_us'] - 1
+        regressed = change > args.threshold
+        if regressed:
+            regressions.append(name)
+        print('{0:40} {1:12.1f}us {2:+8.1%}{3}'.format(
+            name, result['latency_us'], change,
+            ' regression' if regressed else ''))
+
+    if regressions:
+        print('{0} regressions over {1:.0%}'.format(
+            len(regressions), args.threshold))
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    run_parser = commands.add_parser('run', help='runs benchmarks')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument(
+        '--only', nargs='+', help='runs cases which names contain any of')
+    run_parser.add_argument('--save', help='saves results to the file')
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        'compare', help='compares latency with the baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='slowdown to report as regression, 0.1 is 10%%')
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from typus import en_typus, ru_typus
+from typus.aio import Coalescer
+from typus.pool import TypusPool
+
+
+def test_aprocess():
+    result = asyncio.run(ru_typus.aprocess('"1mm"', debug=True))
+    assert result == '«1_mm»'
+
+
+def test_coalescer_batches(mocker):
+    run = mocker.spy(ru_typus, 'map')
+
+    async def main():
+        async with Coalescer(ru_typus, delay=0.05) as coalescer:
+            return await asyncio.gather(
+                coalescer('"foo"'),
+                coalescer('1mm', debug=True),
+                coalescer('(c)'),
+                coalescer('(c)', escape_phrases=['(c)']),
+            )
+
+    assert asyncio.run(main()) == ['«foo»', '1_mm', '©', '(c)']
+    assert run.call_count == 3
+
+
+def test_coalescer_max_batch(mocker):
+    run = mocker.spy(en_typus, 'map')
+
+    async def main():
+        coalescer = Coalescer(en_typus, delay=0.05, max_batch=2)
+        result = await asyncio.gather(*(coalescer(str(i)) for i in range(5)))
+        await coalescer.close()
+        return result
+
+    assert asyncio.run(main()) == ['0', '1', '2', '3', '4']
+    assert run.call_count == 3
+
+
+def test_coalescer_pool():
+    async def main():
+        with TypusPool(en_typus, workers=2) as pool:
+            async with Coalescer(en_typus, pool=pool) as coalescer:
+                return await coalescer('"foo"')
+
+    assert asyncio.run(main()) == '“foo”'
+
+
+class SmallCoalescer(Coalescer):
+    max_queue = 1
+    block = False
+
+
+def test_coalescer_queue_full():
+    async def main():
+        async with SmallCoalescer(en_typus) as coalescer:
+            first = asyncio.ensure_future(coalescer('foo'))
+            await asyncio.sleep(0)
+            with pytest.raises(asyncio.QueueFull):
+                await coalescer('bar')
+            return await first
+
+    assert asyncio.run(main()) == 'foo'
+
+
+def test_coalescer_error():
+    async def main():
+        async with Coalescer(en_typus) as coalescer:
+            return await coalescer(None)
+
+    with pytest.raises(AttributeError):
+        asyncio.run(main())
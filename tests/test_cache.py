@@ -0,0 +1,96 @@
+import pytest
+
+from typus import EnTypus, RuTypus, en_typus
+from typus.cache import ResultCache
+from typus.chars import NBSP
+
+
+@pytest.fixture(name='typus')
+def get_typus():
+    return EnTypus(cache=ResultCache(maxsize=2))
+
+
+def test_no_cache():
+    assert en_typus.cache is None
+
+
+def test_hits(typus, mocker):
+    mocker.spy(typus.procs, 'run')
+    assert typus('"foo"') == typus('"foo"') == '“foo”'
+    assert typus.procs.run.call_count == 1
+    assert typus.cache.info()[:4] == (1, 1, 0, 1)
+
+
+def test_kwargs(typus):
+    assert typus('1mm (c)', debug=True) == '1_mm ©'
+    assert typus('1mm (c)', debug=False) == f'1{NBSP}mm ©'
+    assert typus('1mm (c)', escape_phrases=['(c)']) == f'1{NBSP}mm (c)'
+    assert typus('1mm (c)', escape_phrases=['(c)']) == f'1{NBSP}mm (c)'
+    assert typus.cache.info()[:4] == (1, 3, 1, 2)
+
+
+def test_shared(typus):
+    ru_typus = RuTypus(cache=typus.cache)
+    assert typus('"foo"') == '“foo”'
+    assert ru_typus('"foo"') == '«foo»'
+    assert EnTypus(cache=typus.cache)('"foo"') == '“foo”'
+    assert typus.cache.info()[:4] == (1, 2, 0, 2)
+
+
+def test_unhashable(typus):
+    assert typus('(c)', foo=bytearray()) == '©'
+    assert typus.cache.info()[:4] == (0, 0, 0, 0)
+
+
+def test_lru(typus):
+    typus('a')
+    typus('b')
+    typus('a')
+    typus('c')  # drops `b`
+    typus('a')
+    assert typus.cache.info()[:4] == (2, 3, 1, 2)
+
+
+def test_maxbytes():
+    cache = ResultCache(maxbytes=200)
+    typus = EnTypus(cache=cache)
+    typus('a' * 50)
+    assert len(cache) == 1
+    typus('b' * 50)
+    assert len(cache) == 1
+    assert cache.bytes <= 200
+    assert cache.info().evictions == 1
+
+
+def test_maxbytes_oversize():
+    cache = ResultCache(maxbytes=200)
+    typus = EnTypus(cache=cache)
+    typus('a' * 50)
+    typus('b' * 500)
+    assert len(cache) == 1
+    assert cache.info().evictions == 0
+    assert typus('b' * 500) == 'b' * 500
+    assert cache.info()[:2] == (0, 3)
+
+
+def test_admit_after():
+    cache = ResultCache(admit_after=2)
+    typus = EnTypus(cache=cache)
+    typus('a')
+    assert len(cache) == 0
+    typus('a')
+    typus('a')
+    assert cache.info()[:4] == (1, 2, 0, 1)
+
+
+def test_clear(typus):
+    typus('a')
+    typus.cache.clear()
+    assert typus.cache.info()[:5] == (0, 0, 0, 0, 0)
+
+
+def test_map(typus, mocker):
+    mocker.spy(typus.procs, 'run')
+    typus('a')
+    assert typus.map(['a', 'b', 'a']) == ['a', 'b', 'a']
+    assert typus.procs.run.call_count == 2
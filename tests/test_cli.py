@@ -0,0 +1,98 @@
+import io
+import os
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from typus import cli, en_typus, ru_typus
+
+from .test_stream import DOCUMENT
+
+
+@pytest.fixture(name='docs')
+def get_docs(tmp_path):
+    (tmp_path / 'docs' / 'sub').mkdir(parents=True)
+    (tmp_path / 'docs' / 'a.txt').write_text('"foo" (c)\n', encoding='utf-8')
+    (tmp_path / 'docs' / 'sub' / 'b.html').write_text(
+        '<b title="x">"bar"</b> -- baz', encoding='utf-8')
+    (tmp_path / 'docs' / 'c.bin').write_bytes(b'"x"')
+    return tmp_path / 'docs'
+
+
+def test_output(docs, tmp_path):
+    assert cli.main([str(docs), '-o', str(tmp_path / 'out')]) == 0
+    assert sorted(
+        str(x.relative_to(tmp_path / 'out'))
+        for x in (tmp_path / 'out').rglob('*')) == [
+        'a.txt', 'sub', 'sub/b.html']
+    assert (tmp_path / 'out' / 'a.txt').read_text('utf-8') == '“foo” ©\n'
+    assert (docs / 'a.txt').read_text('utf-8') == '"foo" (c)\n'
+
+
+def test_output_files(docs, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (docs / 'sub' / 'a.txt').write_text('(r)', encoding='utf-8')
+    assert cli.main(['docs/a.txt', 'docs/sub/a.txt', '-o', 'out']) == 0
+    assert (tmp_path / 'out' / 'docs' / 'a.txt').read_text('utf-8') == (
+        '“foo” ©\n')
+    assert (tmp_path / 'out' / 'docs' / 'sub' / 'a.txt').read_text(
+        'utf-8') == '®'
+
+
+def test_in_place(docs):
+    assert cli.main([
+        str(docs / 'sub' / 'b.html'), '--in-place', '--lang', 'ru',
+        '--no-html', '-p', 'baz']) == 0
+    assert (docs / 'sub' / 'b.html').read_text('utf-8') == (
+        '<b\xa0title=«x»>«bar»</b> — baz')
+
+
+def test_in_place_mode(docs):
+    path = docs / 'a.txt'
+    os.chmod(str(path), 0o640)
+    assert cli.main([str(path), '-i']) == 0
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+    assert path.read_text('utf-8') == '“foo” ©\n'
+
+
+def test_escape_phrases_file(docs, tmp_path):
+    phrases = tmp_path / 'phrases.txt'
+    phrases.write_text('(c)\n\n', encoding='utf-8')
+    assert cli.main([
+        str(docs), '-i', '--escape-phrases', str(phrases),
+        '--glob', '*.txt']) == 0
+    assert (docs / 'a.txt').read_text('utf-8') == '“foo” (c)\n'
+    assert (docs / 'sub' / 'b.html').read_text('utf-8').startswith('<b ')
+
+
+def test_large_file(docs, mocker):
+    mocker.patch.object(cli, 'LARGE_FILE', 1024)
+    path = docs / 'large.txt'
+    path.write_text('\n' + DOCUMENT + '\n', encoding='utf-8')
+    assert cli.main([str(path), '-i', '--lang', 'ru', '-j', '2']) == 0
+    assert path.read_text('utf-8') == '\n' + ru_typus(DOCUMENT) + '\n'
+
+
+def test_errors(docs, capsys):
+    (docs / 'a.txt').write_bytes(b'\xff')
+    assert cli.main([str(docs), '-i']) == 1
+    assert 'a.txt' in capsys.readouterr().err
+    assert (docs / 'sub' / 'b.html').read_text('utf-8').startswith('<b ')
+
+    with pytest.raises(SystemExit):
+        cli.main([str(docs)])
+
+
+def test_stdin(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.StringIO(' "foo" (c)\n'))
+    assert cli.main([]) == 0
+    assert capsys.readouterr().out == ' ' + en_typus('"foo" (c)') + '\n'
+
+
+def test_module():
+    result = subprocess.run(
+        [sys.executable, '-m', 'typus', '--lang', 'ru'],
+        input='"foo"'.encode('utf-8'), stdout=subprocess.PIPE, check=True)
+    assert result.stdout.decode('utf-8') == '«foo»'
@@ -0,0 +1,73 @@
+import pytest
+
+from typus import ru_typus
+from typus.columnar import apply
+from typus.pool import TypusPool
+
+SOURCE = ['"foo"', '(c)', '"foo"', '  ', 'foo - bar']
+EXPECTED = [ru_typus(text) for text in SOURCE]
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    result = apply(numpy.array(SOURCE).reshape(5, 1), ru_typus)
+    assert result.shape == (5, 1)
+    assert result.ravel().tolist() == EXPECTED
+
+
+def test_numpy_objects():
+    numpy = pytest.importorskip('numpy')
+    array = numpy.array(SOURCE + [None, 1.5], dtype=object)
+    result = apply(array, ru_typus)
+    assert result.tolist() == EXPECTED + [None, 1.5]
+    assert array.tolist() == SOURCE + [None, 1.5]
+
+
+@pytest.mark.parametrize('dtype', (object, 'string', 'category'))
+def test_pandas(dtype):
+    pandas = pytest.importorskip('pandas')
+    series = pandas.Series(
+        SOURCE + [None], index=list('abcdef'), name='title', dtype=dtype)
+    result = apply(series, ru_typus)
+    assert result.index.equals(series.index)
+    assert result.name == 'title'
+    assert result.isna().tolist() == [False] * 5 + [True]
+    assert result.dtype.name == series.dtype.name
+    assert result[:5].tolist() == EXPECTED
+
+
+@pytest.mark.parametrize('dtype', (object, 'string', 'category'))
+@pytest.mark.parametrize('source', ([], [None, None]))
+def test_pandas_empty(dtype, source):
+    pandas = pytest.importorskip('pandas')
+    series = pandas.Series(source, name='title', dtype=dtype)
+    result = apply(series, ru_typus)
+    assert result is not series
+    assert result.equals(series)
+    assert result.dtype.name == series.dtype.name
+
+
+def test_pyarrow():
+    pyarrow = pytest.importorskip('pyarrow')
+    array = pyarrow.chunked_array(
+        [SOURCE[:2], SOURCE[2:] + [None]], type=pyarrow.large_string())
+    result = apply(array, ru_typus)
+    assert result.type == array.type
+    assert result.to_pylist() == EXPECTED + [None]
+
+    encoded = pyarrow.array(SOURCE).dictionary_encode()
+    result = apply(encoded, ru_typus)
+    assert result.type == encoded.type
+    assert result.to_pylist() == EXPECTED
+
+
+def test_pool():
+    numpy = pytest.importorskip('numpy')
+    with TypusPool(ru_typus, chunk_size=1) as pool:
+        result = apply(numpy.array(SOURCE), pool=pool, debug=True)
+    assert result.tolist() == ru_typus.map(SOURCE, debug=True)
+
+
+def test_unknown_array():
+    with pytest.raises(ValueError):
+        apply(SOURCE)
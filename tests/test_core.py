@@ -1,6 +1,11 @@
+import subprocess
+import sys
+
 import pytest
 
-from typus import TypusCore, ru_typus
+from typus import EnTypus, TypusCore, en_typus, ru_typus
+
+from .test_stream import EDGES
 
 
 def test_empty_string(mocker):
@@ -19,3 +24,142 @@ def test_no_processors():
 
     with pytest.raises(AssertionError):
         Testus()
+
+
+def test_lazy_import():
+    # Startup budget: no processors built and no heavy modules imported
+    modules = ('asyncio', 'concurrent.futures', 'typus.cache',
+               'typus.phrases', 'typus.analysis', 'typus.prefork')
+    code = (
+        'import sys, typus;'
+        'print("en_typus" in vars(typus), *(x in sys.modules for x in {0!r}));'
+        'print("procs" in vars(typus.en_typus))'
+    ).format(modules)
+    output = subprocess.check_output(
+        (sys.executable, '-c', code), universal_newlines=True)
+    assert output.split() == ['False'] * (len(modules) + 2)
+
+
+def test_lazy_procs():
+    class Testus(TypusCore):
+        processors = ru_typus.processors
+
+    testus = Testus()
+    assert 'procs' not in vars(testus)
+    assert testus('(c)') == '©'
+    assert vars(testus)['procs'] is testus.procs
+
+
+@pytest.mark.parametrize('data', (
+    '"foo" (c)'.encode('utf-8'),
+    bytearray('"foo" (c)', 'utf-8'),
+    memoryview('"foo" (c)'.encode('utf-8')),
+))
+def test_process_bytes(data):
+    assert ru_typus.process_bytes(data) == '«foo» ©'.encode('utf-8')
+    assert ru_typus.process_bytes(
+        '2mm'.encode('cp1251'), encoding='cp1251', debug=True) == b'2_mm'
+
+
+@pytest.mark.parametrize('data, expected', (
+    (b'foo', b'foo'),
+    (bytearray(b'foo'), b'foo'),
+    (b' foo ', b'foo'),
+    (b'', b''),
+))
+def test_process_bytes_unchanged(data, expected):
+    processed = ru_typus.process_bytes(data)
+    assert type(processed) is bytes
+    assert processed == expected
+    if type(data) is bytes and data == expected:
+        assert processed is data
+
+
+def test_process_bytes_invalid():
+    with pytest.raises(ValueError):
+        ru_typus.process_bytes(b'\xff')
+
+
+def test_map():
+    source = ['"foo"', '  "foo"  ', '', '(c)', '"foo"']
+    assert ru_typus.map(source) == ['«foo»', '«foo»', '', '©', '«foo»']
+
+
+def test_map_processes_duplicates_once(mocker):
+    mocker.spy(ru_typus.procs, 'run_batch')
+    ru_typus.map(['foo', 'bar', 'foo ', ' foo', 'bar'])
+    ru_typus.procs.run_batch.assert_called_once_with(
+        ['foo', 'bar'], debug=False)
+
+
+@pytest.mark.parametrize('texts', (
+    ['"foo', 'bar"', 'foo -', '- bar (c', ')'],
+    ['"foo\uffff" 1', '/2', '<code>"foo', '"</code>'],
+))
+def test_map_batch(texts):
+    assert ru_typus.map(texts) == [ru_typus(text) for text in texts]
+
+
+def test_map_kwargs():
+    phrases = (x for x in ['(c)'])
+    assert ru_typus.map(['(c) 1mm', '(c) 1mm (r)'], escape_phrases=phrases,
+                        debug=True) == ['(c) 1_mm', '(c) 1_mm®']
+
+
+@pytest.mark.parametrize('source, kwargs, expected', (
+    ('a\n\nb\r\n \r\n\nc', {}, [(1, 3), (4, 10)]),
+    ('a\n\n"b\n\nc"\n\nd', {}, [(1, 3), (9, 11)]),
+    ('a\n\n<pre>b\n\nc</pre>\n\nd', {}, [(1, 3), (18, 20)]),
+    ('a\n\nb\n\nc', {'escape_phrases': ['b\n\nc']}, [(1, 3)]),
+
+    # Escaped quotes aren't paired
+    ('"a <code>"</code>\n\nb" c', {}, []),
+    ('"a <!-- " -->\n\nb" c', {}, []),
+    ('"a `"`\n\nb" c', {'escape_phrases': ['`"`']}, []),
+
+    # Incomplete text
+    ('a\n\n"b\n\nc', {'complete': False}, [(1, 3)]),
+    ('a\n\n<pre>b\n\nc', {'complete': False}, [(1, 3)]),
+    ('a\n\n<pre>b</pre>\n\nc', {'complete': False}, [(1, 3), (15, 17)]),
+))
+def test_breaks(source, kwargs, expected):
+    assert ru_typus.breaks(source, **kwargs) == expected
+
+
+@pytest.mark.parametrize('oversize, expected', (
+    ('split', '“foo”\n\n©\xa0bar'),
+    ('ignore', '"foo"\n\n(c) bar'),
+))
+def test_max_input_size(oversize, expected):
+    class Testus(EnTypus):
+        max_input_size = 8
+
+    Testus.oversize = oversize
+    assert Testus()('"foo"\n\n(c) bar') == expected
+    assert Testus().map(['"foo"\n\n(c) bar', '"a"']) == [expected, '“a”']
+
+
+@pytest.mark.parametrize('source', EDGES)
+def test_max_input_size_edges(source):
+    class Testus(EnTypus):
+        max_input_size = 16
+
+    assert Testus()(source) == en_typus(source)
+
+
+def test_max_input_size_raise():
+    class Testus(EnTypus):
+        max_input_size = 8
+        oversize = 'raise'
+
+    assert Testus()('"foo"') == '“foo”'
+    with pytest.raises(ValueError):
+        Testus()('"foo"\n\n(c) bar')
+
+
+def test_unknown_oversize():
+    class Testus(EnTypus):
+        oversize = 'truncate'
+
+    with pytest.raises(ValueError):
+        Testus()
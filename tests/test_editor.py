@@ -0,0 +1,50 @@
+import pytest
+
+from typus import en_typus
+from typus.editor import Editor
+
+
+@pytest.mark.parametrize('start, end, text', (
+    (0, 0, '"baz"\n\n'),
+    (5, 7, ' -- '),
+    (8, 11, 'quux... (r)'),
+    (0, 13, ''),
+    (13, 13, '\n\n\n'),
+))
+def test_update(start, end, text):
+    editor = Editor(en_typus, '"foo"\n\nbar (c)')
+    source = editor.source[:start] + text + editor.source[end:]
+    assert editor.update(start, end, text) == en_typus(source)
+    assert editor.source == source
+
+
+@pytest.mark.parametrize('source', (
+    'a\n\n\t1" x',
+    '"foo" (c) \r\n\r\n  bar - 1',
+    ' foo \n \n\n\t- bar\n\n',
+))
+def test_paragraph_edges(source):
+    assert Editor(en_typus, source).output == en_typus(source)
+
+
+def test_update_processes_changed(mocker):
+    editor = Editor(en_typus, 'foo (c)\n\nbar (r)\n\nbaz')
+    process = mocker.spy(editor, '_process')
+    assert editor.update(9, 12, 'quux') == 'foo ©\n\nquux®\n\nbaz'
+    process.assert_called_once_with('quux (r)\n\n')
+
+
+def test_positions():
+    editor = Editor(en_typus, 'foo (c)\n\n\n\nbar...')
+    assert editor.output == 'foo ©\n\nbar…'
+    assert editor.to_output(7) == 5
+    assert editor.to_output(9) == 7  # breaks are processed too
+    assert editor.to_output(14) == 10
+    assert editor.to_source(10) == 14
+    assert editor.to_source(7) == 11
+
+
+@pytest.mark.parametrize('start, end', ((-1, 0), (2, 1), (0, 4)))
+def test_update_out_of_range(start, end):
+    with pytest.raises(ValueError):
+        Editor(en_typus, 'foo').update(start, end, 'bar')
@@ -5,6 +5,8 @@ applied earlier, so order matters. But that also means it's important
 to be sure they don't affect each other more than expected. This case
 tests every expression as if it was the only one to apply.
 """
+from unittest import mock
+
 import pytest
 
 from typus.chars import *
@@ -318,3 +320,54 @@ def test_rep_positional_spaces_before(factory, char):
 def test_rdel_positional_spaces_before(factory, char):
     typus = factory('del_positional_spaces')
     assert typus(f'foo {char} bar') == f'foo{char} bar'
+
+
+def test_gating(factory):
+    typus = factory('linebreaks', 'complex_symbols')
+    typus.procs.compiled = tuple(
+        mock.Mock(side_effect=expression)
+        for expression in typus.procs.compiled
+    )
+
+    # Nothing to replace
+    assert typus('foo') == 'foo'
+    assert not any(x.called for x in typus.procs.compiled)
+
+    assert typus('foo\r\n(c)') == 'foo\n©'
+    assert all(x.called for x in typus.procs.compiled)
+
+
+# Edges of texts which may make a rule match across them
+BATCH_PARTS = (
+    '', ' ', 'foo', 'foo ', ' bar', 'foo -', '- bar', '1', '12 -', '/2',
+    '(c', ')', '"', "'", 'x', '3 ', ' mm', 'мм', '.', '..', '\n', ' руб',
+    f'{NBSP}foo', f'foo{NBSP}', '+', '=',
+)
+
+
+def test_batch_separates(factory):
+    typus = factory(*EnRuExpressions.expressions)
+    procs = typus.procs
+    separator = procs.separator
+    for expression, safe in zip(procs.compiled, procs.separates):
+        if not safe:
+            continue
+        for left in BATCH_PARTS:
+            for right in BATCH_PARTS:
+                assert expression(left + separator + right) == (
+                    expression(left) + separator + expression(right))
+
+
+@pytest.mark.parametrize('texts', (
+    ['foo -', '- bar'],
+    ['1', '/2'],
+    ['(c', ')'],
+    ['12 -', '15'],
+    ['foo ', ' bar'],
+    ['3', 'x3'],
+    ['', 'foo', ''],
+))
+def test_batch(factory, texts):
+    typus = factory(*EnRuExpressions.expressions)
+    assert typus.procs.run_batch(texts) == [
+        typus.procs.run(text) for text in texts]
@@ -0,0 +1,42 @@
+import pickle
+
+import pytest
+
+from typus import RuTypus
+from typus.factory import from_config
+
+
+def test_from_config():
+    config = {
+        'lang': 'ru',
+        'quotes': {'engine': 'stack', 'max_depth': 1},
+        'expressions': {'gating': False},
+    }
+    typus = from_config(config)
+    assert isinstance(typus, RuTypus)
+    assert typus('"00 "11" 00" (c)') == '"00 «11» 00″ ©'
+    assert from_config(dict(config)) is typus
+    assert pickle.loads(pickle.dumps(typus))('"foo"') == '«foo»'
+
+
+def test_shared_processors():
+    first = from_config({'quotes': {'engine': 'stack'}})
+    second = from_config({'quotes': {'engine': 'stack'}, 'escape_html': {}})
+    assert first is not second
+    assert first.processors == second.processors
+
+
+def test_remove_processor():
+    typus = from_config({'lang': 'ru', 'escape_html': False})
+    assert typus('<a title="foo">') == '<a\xa0title=«foo»>'
+    assert pickle.loads(pickle.dumps(typus)).processors == typus.processors
+
+
+@pytest.mark.parametrize('config', (
+    {'lang': 'de'},
+    {'foo': {}},
+    {'quotes': {'foo': 1}},
+))
+def test_from_config_errors(config):
+    with pytest.raises(ValueError):
+        from_config(config)
@@ -0,0 +1,55 @@
+import pytest
+
+from typus import en_typus, ru_typus
+from typus.offsets import OffsetMap
+
+
+def process(typus, text, **kwargs):
+    offsets = OffsetMap()
+    return typus.procs.run(text, offsets=offsets, **kwargs), offsets
+
+
+@pytest.mark.parametrize('source, position, expected', (
+    ('(c) foo...', 4, 2),
+    ('(c) foo...', 10, 6),
+    ('foo -- bar', 7, 6),
+    ('<b>(c)</b> foo', 11, 9),
+    ('<b>(c)</b> foo', 1, 1),  # inside of the tag
+    ('<code>(c)</code> (c)', 17, 17),
+))
+def test_offsets(source, position, expected):
+    _, offsets = process(en_typus, source)
+    assert offsets.to_output(position) == expected
+    assert offsets.to_source(expected) == position
+
+
+@pytest.mark.parametrize('typus', (en_typus, ru_typus))
+@pytest.mark.parametrize('source', (
+    '"foo" -- bar... (c) 1/2 10x10',
+    '<p class="foo">"bar" <!-- -- --> 1 -- 2</p>',
+    'foo +- bar 1mm 10 000 000',
+))
+def test_offsets_monotonic(typus, source):
+    output, offsets = process(typus, source)
+    positions = [offsets.to_output(x) for x in range(len(source) + 1)]
+    assert positions == sorted(positions)
+    assert positions[0] == 0
+    assert positions[-1] == len(output)
+    sources = [offsets.to_source(x) for x in range(len(output) + 1)]
+    assert sources == sorted(sources)
+    assert sources[-1] == len(source)
+
+
+def test_offsets_phrases():
+    output, offsets = process(
+        en_typus, 'foo (c) bar', escape_phrases=['(c) bar'])
+    assert output == 'foo (c) bar'
+    assert offsets.to_output(6) == 6
+
+
+def test_offsets_empty():
+    offsets = OffsetMap()
+    assert not offsets
+    assert en_typus.procs.run('foo', offsets=offsets) == 'foo'
+    assert not offsets
+    assert offsets.to_output(2) == offsets.to_source(2) == 2
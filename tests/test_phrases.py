@@ -0,0 +1,66 @@
+import pickle
+
+import pytest
+
+from typus import compile_phrases, en_typus
+from typus.cache import ResultCache
+from typus.phrases import PhraseSet
+
+
+@pytest.mark.parametrize('phrases, text, expected', (
+    (['foo'], 'foo bar foo', ['foo', 'foo']),
+
+    # Leftmost, then longest
+    (['foo', 'foobar'], 'foobar foo', ['foobar', 'foo']),
+    (['foobar', 'foo'], 'foobaz', ['foo']),
+    (['bar baz', 'foo bar'], 'foo bar baz', ['foo bar']),
+    (['ab', 'abcd', 'bc'], 'abc', ['ab']),
+
+    # Special chars and case
+    (['(c)', 'a.b', '[x]'], 'a.b axb [x] (C) (c)', ['a.b', '[x]', '(c)']),
+
+    # Blank ones are skipped
+    (['', ' '], 'foo ', []),
+    ([], 'foo', []),
+))
+def test_finditer(phrases, text, expected):
+    matches = compile_phrases(phrases).finditer(text)
+    assert [match.group() for match in matches] == expected
+
+
+def test_compile_phrases():
+    phrases = compile_phrases(('foo', 'bar', 'foo', ''))
+    assert phrases is compile_phrases(['foo', 'bar', 'foo', ''])
+    assert phrases is compile_phrases(phrases)
+    assert list(phrases) == ['foo', 'bar']
+    assert len(phrases) == 2
+    assert phrases == PhraseSet(['foo', 'bar'])
+    assert pickle.loads(pickle.dumps(phrases)) is phrases
+
+
+@pytest.mark.parametrize('source, phrases', (
+    ('"foo 2""', ['2"']),
+    ('"foo (c) (r) (tm)"', ['(c)', '(r)', '(tm)']),
+    ('<b>"(c)"</b> (c)', ['"(c)"']),
+    ('"foo"', ['']),
+))
+def test_escape_phrases(source, phrases):
+    expected = en_typus(source, escape_phrases=phrases)
+    assert en_typus(source, escape_phrases=compile_phrases(phrases)) \
+        == expected
+
+
+def test_batch():
+    phrases = compile_phrases(['(c) 2018'])
+    texts = ['"(c) 2018"', '(c) 2018', '"(c)"']
+    expected = ['“(c) 2018”', '(c) 2018', '“©”']
+    assert en_typus.map(texts, escape_phrases=phrases) == expected
+    assert ''.join(en_typus.stream(
+        ['"(c)', ' 2018"\n\n'], escape_phrases=phrases)) == expected[0]
+
+
+def test_cache():
+    phrases = compile_phrases(['(c)'])
+    key = ResultCache.key('(c)', False, {'escape_phrases': phrases})
+    assert key == ResultCache.key(
+        '(c)', False, {'escape_phrases': compile_phrases(['(c)'])})
@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from typus import EnTypus, en_typus, ru_typus
+from typus.pool import TypusPool
+
+from .test_stream import DOCUMENT, EDGES
+
+
+def test_pickle():
+    typus = pickle.loads(pickle.dumps(ru_typus))
+    assert typus is not ru_typus
+    assert typus('"foo"') == '«foo»'
+
+
+@pytest.mark.parametrize('executor', ('thread', 'process'))
+def test_map(executor):
+    source = ['"foo"', '(c)', ' "foo" ', '', '1mm ' * 100]
+    with TypusPool(ru_typus, executor=executor, workers=2,
+                   chunk_size=10) as pool:
+        assert pool.map(source) == ru_typus.map(source)
+        assert pool.map(source, debug=True) == ru_typus.map(
+            source, debug=True)
+
+
+def test_map_escape_phrases():
+    phrases = (x for x in ['(c)'])
+    with TypusPool(en_typus, chunk_size=1) as pool:
+        result = pool.map(['(c) (r)', '(r) (c)'], escape_phrases=phrases)
+    assert result == ['(c)®', '® (c)']
+
+
+@pytest.mark.parametrize('executor', ('thread', 'process'))
+def test_process(executor):
+    with TypusPool(ru_typus, executor=executor, workers=2,
+                   chunk_size=100) as pool:
+        assert pool.process(DOCUMENT) == ru_typus(DOCUMENT)
+        assert pool.process(DOCUMENT, debug=True) == ru_typus(
+            DOCUMENT, debug=True)
+        assert pool.process(' (c) ') == ru_typus('(c)')
+
+
+@pytest.mark.parametrize('source', (
+    'foo - bar\n\n* - 5',
+    'foo - 1\n\nbar\n\n"baz - 2"',
+    '<pre>\n\nfoo\n\n</pre>\n\n(c)',
+    '"a <code>"</code>\n\nb" c\n\nd',
+    '"Hello <!-- the " mark -->\n\nworld" end\n\nd',
+) + EDGES)
+def test_process_paragraphs(mocker, source):
+    process_part = mocker.spy(en_typus, 'process_part')
+    with TypusPool(en_typus, chunk_size=1) as pool:
+        assert pool.process(source) == en_typus(source)
+    assert process_part.call_count > 1
+
+
+def test_chunks():
+    pool = TypusPool(EnTypus(), chunk_size=5)
+    texts = ['a' * 10, 'bbb', 'cc', 'd', 'e']
+    assert list(pool._chunks(texts)) == [
+        ['a' * 10], ['bbb', 'cc'], ['d', 'e']]
+    pool.close()
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        TypusPool(en_typus, executor='fibers')
@@ -2,7 +2,15 @@ from unittest import mock
 
 import pytest
 
-from typus import EscapeHtml, EscapePhrases, RuQuotes, TypusCore, ru_typus
+from typus import (
+    EnRuExpressions,
+    EscapeHtml,
+    EscapePhrases,
+    RuQuotes,
+    TypusCore,
+    ru_typus,
+)
+from typus.chars import MDASH_PAIR
 
 
 @pytest.mark.parametrize('source, expected, escape_phrases', (
@@ -32,6 +40,37 @@ def test_restore_html_call(mock_restore_values):
     mock_restore_values.assert_called_once()
 
 
+@pytest.mark.parametrize('source, expected', (
+    # Keys and markers in the source text
+    ('{#html0#} <b>(c)</b>', '{#html0#} <b>©</b>'),
+    ('\ue000 \ue001\ue100\ue001 <b>(c)</b>',
+     '\ue000 \ue001\ue100\ue001 <b>©</b>'),
+    ('<b>"test"</b>' * 300, '<b>«test»</b>' * 300),
+    # Keys are word boundaries for mdash
+    ('</b> - 1', f'</b>{MDASH_PAIR}1'),
+    ('<br/> - 2', f'<br/>{MDASH_PAIR}2'),
+    ('test - 2', f'test{MDASH_PAIR}2'),
+))
+def test_escape_keys(source, expected):
+    assert ru_typus(source, escape_phrases=['test']) == expected
+
+
+def test_escape_marker():
+    # Any of `chars.MARKERS` is a word boundary for mdash
+    escape = type('Escape', (EscapeHtml, ), {'marker': '\ue0ff'})
+
+    class Typus(TypusCore):
+        processors = (escape, EnRuExpressions)
+
+    assert Typus()('</b> - 1') == f'</b>{MDASH_PAIR}1'
+
+
+@pytest.mark.parametrize('marker', ('x', '\ue100'))
+def test_escape_marker_options(marker):
+    with pytest.raises(ValueError):
+        type('Escape', (EscapeHtml, ), {'marker': marker})(None)
+
+
 @pytest.mark.parametrize('source', (
     '<pre>"test"</pre>',
     '<code>"test"</code>',
@@ -51,11 +90,28 @@ def test_codeblocks(source):
 @pytest.mark.parametrize('source, expected', (
     (
         '<code>dsfsdf <code>"test"</code> "sdfdf"</code>',
-        '<code>dsfsdf <code>"test"</code> «sdfdf»</code>',
+        '<code>dsfsdf <code>"test"</code> "sdfdf"</code>',
+    ),
+    (
+        '<pre><code>"test"</code> "test"</pre> "test"',
+        '<pre><code>"test"</code> "test"</pre> «test»',
+    ),
+    (
+        '<code><code>"test"</code> "test"',
+        '<code><code>"test"</code> «test»',
+    ),
+
+    # Unclosed outer tag is escaped up to the first closing one
+    (
+        '<pre>"test" <pre>"test"</pre> "test"',
+        '<pre>"test" <pre>"test"</pre> «test»',
+    ),
+    (
+        '<pre>"test" <pre><pre>"test"</pre>"test"</pre> "test"',
+        '<pre>"test" <pre><pre>"test"</pre>«test»</pre> «test»',
     ),
 ))
 def test_nested_codeblocks(typus, source, expected):
-    # No nested codeblocks
     assert typus(source) == expected
 
 
@@ -104,18 +160,49 @@ def test_iframe(source):
     assert ru_typus(source) == source
 
 
-@pytest.fixture(name='typus')
-def get_typus():
+@pytest.mark.parametrize('source, expected', (
+    ('<img alt="\'test\'">', '<img alt="«test»">'),
+    (
+        '<a title=\'"test"\' href="(c)">(c)</a>',
+        '<a title=\'«test»\' href="(c)">©</a>',
+    ),
+    ('<code title="(c)">(c)</code>', '<code title="(c)">(c)</code>'),
+    ('</a title="(c)">', '</a title="(c)">'),
+))
+def test_attributes(source, expected):
+    class MyEscapeHtml(EscapeHtml):
+        attributes = ('title', 'alt')
+
+    class Typus(TypusCore):
+        processors = ru_typus.processors[:1] + (
+            MyEscapeHtml, ) + ru_typus.processors[2:]
+
+    assert Typus()(source) == expected
+
+
+@pytest.fixture(name='typus', params=('regex', 'stack'))
+def get_typus(request):
+    class Quotes(RuQuotes):
+        engine = getattr(request, 'param', 'regex')
+
     class Typus(TypusCore):
         processors = (
             EscapePhrases,
             EscapeHtml,
-            RuQuotes,
+            Quotes,
         )
 
     return Typus()
 
 
+def test_quotes_gating(typus):
+    quotes = list(typus.procs)[-1]
+    with mock.patch.object(quotes, 're_normal') as re_normal:
+        assert typus('00 11 00') == '00 11 00'
+    re_normal.subn.assert_not_called()
+
+
+@pytest.mark.parametrize('typus', ('regex', ), indirect=True)
 @mock.patch('typus.processors.BaseQuotes._switch_nested', return_value='test')
 def test_switch_nested_call(mock_switch_nested, typus):
     # No quotes
@@ -187,6 +274,59 @@ def test_quotes(typus, source, expected):
     assert typus(source) == expected
 
 
+@pytest.mark.parametrize('options, source, expected', (
+    ({}, '"00 "11" 00"', '«00 „11“ 00»'),
+    ({'max_depth': 1}, '"00 "11" 00"', '"00 «11» 00"'),
+    ({'max_depth': 1}, '"00" "11"', '«00» «11»'),
+    ({}, '"00\n\n11"', '«00\n\n11»'),
+    ({'scope': 'paragraph'}, '"00\n\n11"', '"00\n\n11"'),
+    ({'scope': 'paragraph'}, '"00"\n\n"11"', '«00»\n\n«11»'),
+))
+def test_stack_quotes(options, source, expected):
+    quotes = type('Quotes', (RuQuotes, ), dict(options, engine='stack'))
+
+    class Typus(TypusCore):
+        processors = (quotes, )
+
+    assert Typus()(source) == expected
+
+
+@pytest.mark.parametrize('levels', (2, 3, 40))
+def test_quotes_regex_depth(mocker, levels):
+    class Quotes(RuQuotes):
+        regex_depth = 2
+
+    class Typus(TypusCore):
+        processors = (Quotes, )
+
+    class Deep(TypusCore):
+        processors = (RuQuotes, )
+
+    # Deeper quotes are paired by the stack engine, the same way
+    typus, deep = Typus(), Deep()
+    opening = ''.join('"\''[x % 2] + 'a ' for x in range(levels))
+    source = opening + 'x' + opening[::-1]
+    spy = mocker.spy(Quotes, '_replace_pairs')
+    assert typus(source) == deep(source)
+    assert typus.procs.run_batch([source, '"a"']) == [deep(source), '«a»']
+    assert spy.called == (levels > 2)
+
+    # Breaks within quotes are kept
+    text = opening + 'x\n\ny' + opening[::-1] + '\n\n"z'
+    for complete in (True, False):
+        assert typus.breaks(text, complete=complete) == \
+            deep.breaks(text, complete=complete)
+
+
+@pytest.mark.parametrize('options', (
+    {'engine': 'foo'},
+    {'engine': 'stack', 'scope': 'foo'},
+))
+def test_quotes_options(options):
+    with pytest.raises(ValueError):
+        type('Quotes', (RuQuotes, ), options)(None)
+
+
 @pytest.mark.parametrize('source, expected', (
     # Html test
     ('<span>"11"</span>', '<span>«11»</span>'),
@@ -194,3 +334,17 @@ def test_quotes(typus, source, expected):
 ))
 def test_me(typus, source, expected):
     assert typus(source) == expected
+
+
+@pytest.mark.parametrize('texts', (
+    ['"foo', 'bar"'],
+    ['"foo" "', '"bar"'],
+    ['"foo "bar" baz"', '"foo"'],
+    ["'foo", "'"],
+    ['<code>"foo', 'bar"</code>'],
+    ['<b title="', '">"foo"</b>'],
+    ['"foo\uffff', 'bar"'],
+))
+def test_quotes_batch(typus, texts):
+    assert typus.procs.run_batch(texts) == [
+        typus.procs.run(text) for text in texts]
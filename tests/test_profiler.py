@@ -0,0 +1,67 @@
+from typus import EnTypus, en_typus
+from typus.cache import ResultCache
+from typus.profiler import Profiler
+
+
+def test_profiler():
+    with en_typus.profile() as profiler:
+        assert en_typus('"foo" -- bar (c)') == '“foo”\u202f—\u2009bar ©'
+        en_typus('foo')
+
+    names = [stat.name for stat in profiler.stats()]
+    assert 'EscapeHtml' in names
+    assert 'EnRuExpressions/complex_symbols[0]' in names
+
+    quotes = profiler['EnQuotes']
+    assert quotes.calls == 2
+    assert quotes.matches is None
+    assert quotes.bytes_in == len('"foo" -- bar (c)foo')
+
+    mdash = profiler['EnRuExpressions/mdash[0]']
+    assert mdash.calls == 1  # gated for `foo`
+    assert mdash.matches == 1
+    assert mdash.bytes_out > mdash.bytes_in  # spaces are multibyte
+
+    # Processors are restored
+    assert 'run' not in vars(list(en_typus.procs)[0])
+    en_typus('foo')
+    assert profiler['EnQuotes'].calls == 2
+
+    # Same records are used next time
+    with profiler:
+        en_typus('foo')
+    assert profiler['EnQuotes'].calls == 3
+
+    profiler.reset()
+    assert profiler['EnQuotes'].calls == 0
+    assert profiler['EnRuExpressions/mdash[0]'].matches == 0
+
+
+def test_profiler_report():
+    typus = EnTypus()
+    with Profiler(typus) as profiler:
+        typus('"foo" -- bar (c)')
+
+    names = [stat.name for stat in profiler.stats(sort='matches')]
+    assert 'EnRuExpressions/mdash[0]' in names
+    assert profiler.report().count('\n') == len(names)
+    assert sum(stat.time for stat in profiler.stats()) > 0
+
+
+def test_trace():
+    typus = EnTypus(cache=ResultCache())
+    trace = typus.trace('"foo" -- bar (c)')
+    assert trace.text == en_typus('"foo" -- bar (c)')
+    assert trace.cached is False
+
+    stages = {stage.name: stage for stage in trace.stages}
+    assert stages['EnQuotes'].calls == 1
+    assert stages['EnRuExpressions/mdash[0]'].matches == 1
+    assert stages['EnRuExpressions/primes[0]'].calls == 0  # gated
+
+    # Traced results are cached as usual
+    assert typus.trace('"foo" -- bar (c)') == (trace.text, True, [])
+    assert typus('"foo" -- bar (c)') == trace.text
+    assert typus.cache.info().hits == 2
+    assert en_typus.trace('foo').cached is None
+    assert en_typus.trace('"foo"', stages=False) == ('“foo”', None, [])
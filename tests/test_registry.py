@@ -0,0 +1,80 @@
+import re
+
+import pytest
+
+from typus import EnTypus
+from typus.processors import EnRuExpressions
+from typus.registry import Registry, registry
+from typus.utils import idict, map_choices
+
+
+def closure(value):
+    def inner(match):
+        return value
+    return inner
+
+
+@pytest.mark.parametrize('left, right, equal', (
+    ('foo', 'foo', True),
+    ([1, 2], (1, 2), True),
+    (1, 1.0, False),
+    (1, True, False),
+    ({'a': 1}, {'a': 1}, True),
+    ({'a': 1}, idict({'a': 1}), False),
+    (re.compile('a'), re.compile('a'), True),
+    (re.compile('a'), re.compile('a', re.I), False),
+    (closure('a'), closure('a'), True),
+    (closure('a'), closure('b'), False),
+    (map_choices({'a': 1})[1], map_choices({'a': 1})[1], True),
+    (map_choices({'a': 1})[1], map_choices({'a': 2})[1], False),
+))
+def test_key(left, right, equal):
+    assert (Registry.key(left) == Registry.key(right)) is equal
+
+
+def test_key_unhashable():
+    assert Registry.key(object()) is None
+    assert Registry.key(closure(object())) is None
+
+
+def test_get(mocker):
+    storage = Registry()
+    build = mocker.Mock(return_value='foo')
+    assert storage.get('key', build) == storage.get('key', build) == 'foo'
+    build.assert_called_once()
+
+    # No key, nothing is stored
+    storage.get(None, build)
+    assert build.call_count == 2
+    assert len(storage) == 1
+
+    storage.clear()
+    assert len(storage) == 0
+
+
+def test_shared_expressions():
+    class MyExpressions(EnRuExpressions):
+        pass
+
+    class MyTypus(EnTypus):
+        processors = EnTypus.processors[:-1] + (MyExpressions, )
+
+    first, second = EnTypus(), MyTypus()
+    first_procs, second_procs = list(first.procs), list(second.procs)
+    assert first_procs[-1].compiled is second_procs[-1].compiled
+    assert first_procs[-2].re_normal is second_procs[-2].re_normal
+    assert len(registry)
+
+
+def test_expressions_separator():
+    class SpaceExpressions(EnRuExpressions):
+        separator = ' '
+
+    class SpaceTypus(EnTypus):
+        processors = EnTypus.processors[:-1] + (SpaceExpressions, )
+
+    # Rules looking at spaces can't run over texts joined with them
+    first = list(EnTypus().procs)[-1]
+    second = list(SpaceTypus().procs)[-1]
+    assert first.compiled is not second.compiled
+    assert first.separates != second.separates
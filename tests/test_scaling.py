@@ -0,0 +1,37 @@
+import time
+
+import pytest
+
+from typus import en_typus, ru_typus
+
+# Texts which used to make expressions scan the rest of the text
+# from every position, see `benchmarks.linearity` for sizes up to 10 MB
+CRAFTED = {
+    'words_before_dash': lambda size: 'word ' * (size // 5) + '-- end',
+    'dashes': lambda size: 'foo' + ' - ' * (size // 3) + '1',
+    'nbsp_run': lambda size: 'foo' + '\xa0' * size + '- bar.',
+    'stray_quotes': lambda size: '"foo \'bar ' * (size // 10),
+    'nested_quotes': lambda size: (
+        '"a \'a ' * (size // 12) + ' a\' a"' * (size // 12)),
+    'unclosed_tags': lambda size: '<a ' * (size // 3),
+    'unclosed_comments': lambda size: '<!--' * (size // 4) + '<b>',
+}
+
+
+def measure(text: str) -> float:
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        en_typus(text)
+        ru_typus(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.parametrize('name', CRAFTED)
+def test_linear(name):
+    small, large = (
+        measure(CRAFTED[name](size)) for size in (2 ** 12, 2 ** 16))
+
+    # The text is 16 times larger, quadratic time would be 256 times longer
+    assert large < small * 64
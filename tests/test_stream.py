@@ -0,0 +1,86 @@
+import io
+
+import pytest
+
+from typus import en_typus, ru_typus
+from typus.stream import Stream, StreamWriter
+
+DOCUMENT = '\n\n'.join((
+    '"I don\'t feel very much like Pooh today..." said Pooh.',
+    '"There there," said Piglet.\n"I\'ll bring you tea and honey."',
+    '- A.A. Milne, Winnie-the-Pooh',
+    '<pre>\n\n"no (c) here"\n\n</pre>',
+    '"Quote\n\nover paragraphs"',
+    'Size 10-15 mm, 1/2 price - only 1000 р.',
+)) * 20
+
+# Spaces next to paragraph breaks are processed as in the whole text
+EDGES = (
+    'a\n\n\t1" x',
+    'foo (c) \r\n\r\n  a - 1\r\n\r\n\t"baz"',
+    ' foo \n \n\n\t- bar\xa0\n\n\n 1" \n\n',
+)
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', (1, 7, 64, 1000))
+@pytest.mark.parametrize('window', (256, 4096))
+def test_stream(size, window):
+    stream = ru_typus.stream(chunked(DOCUMENT, size), window=window)
+    assert ''.join(stream) == ru_typus(DOCUMENT)
+    assert stream.peak < window + size
+
+
+@pytest.mark.parametrize('source', EDGES)
+def test_stream_edges(source):
+    parts = list(en_typus.stream(chunked(source, 1), window=16))
+    assert len(parts) > 1
+    assert ''.join(parts) == en_typus(source)
+
+
+def test_stream_scans(mocker):
+    # No safe breaks after an unclosed quote, the buffer is scanned
+    # a few times per window, not on every chunk
+    source = '"' + 'word ' * 2000
+    spy = mocker.spy(en_typus, 'breaks')
+    stream = en_typus.stream(chunked(source, 4), window=1024)
+    assert ''.join(stream) == en_typus(source)
+    assert spy.call_count <= 5 * (len(source) // 1024 + 1)
+
+
+def test_stream_kwargs():
+    stream = en_typus.stream(['(c)\n\n1mm', ' (c)'], escape_phrases=['(c)'],
+                             debug=True, window=16)
+    assert list(stream) == ['(c)', '\n\n1_mm (c)']
+
+
+def test_stream_file():
+    stream = Stream(en_typus, io.StringIO(DOCUMENT), window=512)
+    stream.read_size = 100
+    assert ''.join(stream) == en_typus(DOCUMENT)
+
+
+@pytest.mark.parametrize('source, expected', (
+    # No safe breaks, falls back to other delimiters
+    ('"aaa\n\nbbb\n\nccc"', '"aaa\n\nbbb\n\nccc"'),
+    ('"aaaa\nbbbb\ncccc"', '"aaaa\nbbbb\ncccc"'),
+    ('"aaaa bbbb cccc"', '"aaaa bbbb cccc"'),
+    ('aaaaaaaaaaaaaaaaaaa', 'aaaaaaaaaaaaaaaaaaa'),
+    ('', ''),
+))
+def test_stream_forced_split(source, expected):
+    stream = en_typus.stream(chunked(source, 1), window=8)
+    assert ''.join(stream) == expected
+    assert stream.peak <= 8
+
+
+def test_stream_writer():
+    output = io.StringIO()
+    with StreamWriter(ru_typus, output, window=512) as writer:
+        for chunk in chunked(DOCUMENT, 100):
+            writer.write(chunk)
+            assert writer.peak < 512 + 100
+    assert output.getvalue() == ru_typus(DOCUMENT)
@@ -0,0 +1,64 @@
+import json
+
+from typus import EnTypus
+from typus.cache import ResultCache
+from typus.telemetry import Telemetry, render, snapshot, telemetries
+
+
+def test_telemetry():
+    telemetry = Telemetry(slow=0, capacity=2, sample_rate=1)
+    typus = EnTypus(telemetry=telemetry, cache=ResultCache())
+    for text in ('"foo"', '"foo"', 'foo' * 100, 'bar'):
+        typus(text)
+
+    data = telemetry.snapshot()
+    assert json.loads(json.dumps(data)) == data
+    assert data['calls'] == 4
+    assert sum(data['latency']['64'].values()) == 3
+    assert sum(data['latency']['1024'].values()) == 1
+    assert data['cache'] == {'hits': 1, 'misses': 3, 'hit_rate': 0.25}
+
+    # Ring buffer keeps the last ones
+    assert sorted(x['text'] for x in data['slow']) == ['bar', 'foo' * 100]
+    entry = data['slow'][0]
+    assert entry['cached'] is False
+    assert entry['gated'] == 1  # no characters rules need
+    assert {'EscapeHtml', 'EnQuotes'} <= {x['name'] for x in entry['stages']}
+
+    telemetry.reset()
+    assert telemetry.snapshot()['calls'] == 0
+
+
+def test_telemetry_sampling():
+    telemetry = Telemetry(slow=0, sample_rate=0)
+    typus = EnTypus(telemetry=telemetry)
+    assert typus('"foo"') == '“foo”'
+
+    # Counted but not traced
+    assert telemetry.calls == 1
+    entry, = telemetry.slow_inputs()
+    assert (entry['text'], entry['stages']) == ('"foo"', [])
+
+
+def test_telemetry_registry():
+    telemetry = Telemetry('test', slow=1)
+    EnTypus(telemetry=telemetry)('foo')
+    assert telemetries['test'] is telemetry
+    assert snapshot()['test']['calls'] == 1
+    assert 'typus_latency_seconds_count{typus="test",size="64"} 1' \
+        in render().splitlines()
+    assert 'typus_cache_total{typus="test",result="hit"} 0' in render()
+    del telemetries['test']
+
+
+def test_telemetry_cached():
+    telemetry = Telemetry(slow=0, sample_rate=1)
+    typus = EnTypus(telemetry=telemetry, cache=ResultCache())
+    typus('"foo"')
+    typus('"foo"')
+
+    processed, cached = sorted(
+        telemetry.slow_inputs(), key=lambda x: x['cached'])
+    assert (cached['cached'], cached['stages']) == (True, [])
+    assert processed['cached'] is False
+    assert 'EnQuotes' in {x['name'] for x in processed['stages']}
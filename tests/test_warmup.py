@@ -0,0 +1,21 @@
+from typus import TypusCore, ru_typus, warmup
+from typus.cache import ResultCache
+
+
+def test_warmup(mocker):
+    class Testus(TypusCore):
+        processors = ru_typus.processors
+
+    freeze = mocker.patch('gc.freeze')
+    testus = Testus(cache=ResultCache())
+    warmup([testus])
+    assert 'procs' in vars(testus)
+    assert len(testus.cache) == 0
+    freeze.assert_called_once()
+
+
+def test_warmup_defaults(mocker):
+    freeze = mocker.patch('gc.freeze')
+    warmup(corpus=['"foo"'], freeze=False)
+    assert 'procs' in vars(ru_typus)
+    freeze.assert_not_called()
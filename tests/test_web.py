@@ -0,0 +1,171 @@
+import asyncio
+import io
+import json
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from typus import en_typus, ru_typus
+from typus.web import App
+
+
+async def request(app, method, path, body=b'', query=b''):
+    # Stand-in ASGI client, a list body is sent in chunks
+    chunks = body if isinstance(body, list) else [body]
+    messages = [
+        {'type': 'http.request', 'body': chunk,
+         'more_body': index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path,
+             'query_string': query, 'headers': []}
+    await app(scope, receive, send)
+    assert len(sent) == 2
+    start, response = sent[0], sent[1]
+    headers = dict(start['headers'])
+    assert int(headers[b'content-length']) == len(response['body'])
+    return start['status'], headers[b'content-type'], response['body']
+
+
+def run(app, *requests):
+    async def main():
+        try:
+            return await asyncio.gather(
+                *(request(app, *args) for args in requests))
+        finally:
+            await app.aclose()
+    return asyncio.run(main())
+
+
+def wsgi(app, method, path, body=b'', query=''):
+    environ = {'REQUEST_METHOD': method, 'PATH_INFO': path,
+               'QUERY_STRING': query, 'wsgi.input': io.BytesIO(body),
+               'CONTENT_LENGTH': str(len(body))}
+    setup_testing_defaults(environ)
+    started = []
+    body = b''.join(app.wsgi(
+        environ, lambda status, headers: started.append((status, headers))))
+    assert len(started) == 1
+    status, headers = started[0]
+    return status, dict(headers)['Content-Type'], body
+
+
+@pytest.mark.parametrize('executor', (None, 'thread'))
+def test_asgi(executor):
+    app = App(executor=executor)
+    batch = json.dumps({'texts': ['"foo"', '(c)'], 'debug': True,
+                        'escape_phrases': ['(c)']}).encode('utf-8')
+    (single, debug, phrases, chunked, batched) = run(
+        app,
+        ('POST', '/ru', '"foo" 1mm'.encode('utf-8')),
+        ('POST', '/ru', b'1mm', b'debug=1'),
+        ('POST', '/en/', b'(c) (r)', b'escape_phrase=(c)'),
+        ('POST', '/en', [b'"fo', b'o" (', b'c)']),
+        ('POST', '/en/batch', batch),
+    )
+    assert single == (
+        200, b'text/plain; charset=utf-8',
+        ru_typus('"foo" 1mm').encode('utf-8'))
+    assert debug[2] == b'1_mm'
+    assert phrases[2] == b'(c)\xc2\xae'
+    assert chunked[2].decode('utf-8') == en_typus('"foo" (c)')
+    assert batched[:2] == (200, b'application/json; charset=utf-8')
+    assert json.loads(batched[2].decode('utf-8')) == {
+        'texts': ['“foo”', '(c)']}
+
+
+class SmallApp(App):
+    max_body_size = 100
+    max_batch = 2
+
+
+@pytest.mark.parametrize('method, path, body, status', (
+    ('POST', '/de', b'foo', 404),
+    ('POST', '/en/foo', b'foo', 404),
+    ('POST', '/en/batch/foo', b'foo', 404),
+    ('GET', '/en', b'', 405),
+    ('POST', '/metrics', b'', 405),
+    ('POST', '/en', b'\xff', 400),
+    ('POST', '/en/batch', b'[]', 400),
+    ('POST', '/en/batch', b'{"texts": [1]}', 400),
+    ('POST', '/en/batch', b'{"texts": ["a"], "escape_phrases": "x"}', 400),
+    ('POST', '/en/batch', b'{"texts": ["a"], "escape_phrases": [1]}', 400),
+    ('POST', '/en/batch', b'{', 400),
+    ('POST', '/en', b'x' * 101, 413),
+    ('POST', '/en/batch', b'{"texts": ["", "", ""]}', 413),
+))
+def test_errors(method, path, body, status):
+    app = SmallApp()
+    chunks = [body[i:i + 10] for i in range(0, len(body), 10)] or [b'']
+    (asgi_status, _, _), = run(app, (method, path, chunks))
+    assert asgi_status == status
+    assert wsgi(app, method, path, body)[0].startswith(str(status))
+
+
+def test_content_length_limit():
+    app = SmallApp()
+
+    async def receive():
+        raise AssertionError('body must not be read')
+
+    async def send(message):
+        sent.append(message)
+
+    sent = []
+    scope = {'type': 'http', 'method': 'POST', 'path': '/en',
+             'headers': [(b'content-length', b'101')]}
+    asyncio.run(app(scope, receive, send))
+    assert sent[0]['status'] == 413
+
+
+def test_wsgi():
+    app = App()
+    assert wsgi(app, 'POST', '/ru', b'"foo"', 'debug=true') == (
+        '200 OK', 'text/plain; charset=utf-8', '«foo»'.encode('utf-8'))
+
+
+def test_languages_cache():
+    app = App()
+    assert wsgi(app, 'POST', '/en', b'"foo"')[2] == '“foo”'.encode('utf-8')
+    assert wsgi(app, 'POST', '/ru', b'"foo"')[2] == '«foo»'.encode('utf-8')
+    assert app.cache.info().misses == 2
+
+
+def test_cache_and_metrics():
+    app = App()
+    for _ in range(3):
+        assert wsgi(app, 'POST', '/en', b'(c)')[2] == '©'.encode('utf-8')
+    assert app.cache.info().hits == 2
+
+    status, content_type, body = wsgi(app, 'GET', '/metrics')
+    assert status == '200 OK'
+    assert content_type.startswith('text/plain; version=0.0.4')
+    metrics = body.decode('utf-8')
+    assert metrics.endswith('\n')
+    assert 'typus_cache_total{typus="en",result="hit"} 2' in metrics
+    assert 'typus_cache_total{typus="ru",result="hit"} 0' in metrics
+
+
+def test_lifespan(mocker):
+    app = App(executor='thread')
+    close = mocker.spy(app, 'close')
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    close.assert_called_once_with()
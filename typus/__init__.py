@@ -1,5 +1,7 @@
 # pylint: disable=invalid-name
 
+from typing import TYPE_CHECKING
+
 from .core import TypusCore
 from .processors import (
     EnQuotes,
@@ -9,6 +11,20 @@ from .processors import (
     RuQuotes,
 )
 
+if TYPE_CHECKING:  # pragma: nocover
+    from .phrases import compile_phrases
+    from .prefork import warmup
+
+__all__ = (
+    'EnTypus',
+    'RuTypus',
+    'TypusCore',
+    'compile_phrases',
+    'en_typus',
+    'ru_typus',
+    'warmup',
+)
+
 
 class EnTypus(TypusCore):
     processors = (
@@ -28,4 +44,31 @@ class RuTypus(TypusCore):
     )
 
 
-en_typus, ru_typus = EnTypus(), RuTypus()
+if TYPE_CHECKING:  # pragma: nocover
+    en_typus: EnTypus
+    ru_typus: RuTypus
+
+# Built or imported on first access, so ``import typus`` stays cheap
+LAZY = {
+    'en_typus': EnTypus,
+    'ru_typus': RuTypus,
+    'compile_phrases': 'phrases',
+    'warmup': 'prefork',
+}
+
+
+def __getattr__(name: str):
+    try:
+        factory = LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            'module {0!r} has no attribute {1!r}'.format(__name__, name))
+
+    if isinstance(factory, str):
+        from importlib import import_module
+        value = getattr(import_module('.' + factory, __name__), name)
+    else:
+        value = factory()
+
+    globals()[name] = value
+    return value
@@ -0,0 +1,137 @@
+import asyncio
+from functools import partial
+from typing import List
+
+from .core import TypusCore
+from .pool import TypusPool
+
+__all__ = ('Coalescer', )
+
+
+class Coalescer:
+    """
+    Collects concurrent calls for ``delay`` seconds into one micro-batch
+    and runs it off the event loop, optionally on a
+    :class:`typus.pool.TypusPool`.
+
+    :param typus: :class:`typus.core.TypusCore` instance to run
+    :param pool: Optional :class:`typus.pool.TypusPool` to run batches on
+    :param float delay: Time to wait for other calls to join a batch
+    :param int max_batch: Maximum size of a batch
+
+    Set ``max_queue`` attribute to limit the number of waiting calls.
+    Callers wait for a free slot when the queue is full, unless
+    ``block = False``, then :class:`asyncio.QueueFull` is raised.
+
+    >>> import asyncio
+    >>> from typus import en_typus
+    >>> from typus.aio import Coalescer
+    ...
+    >>> async def main():
+    ...     async with Coalescer(en_typus) as coalescer:
+    ...         return await asyncio.gather(
+    ...             coalescer('"foo"'), coalescer('(c)'))
+    ...
+    >>> asyncio.run(main())
+    ['“foo”', '©']
+    """
+
+    max_queue = 1024
+    block = True
+
+    def __init__(self, typus: TypusCore, pool: TypusPool = None,
+                 delay: float = 0.002, max_batch: int = 256):
+        self.run = (pool or typus).map
+        self.delay = delay
+        self.max_batch = max_batch
+        self.queue = None
+        self.task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def __call__(self, source: str, **kwargs) -> str:
+        if self.task is None:
+            self.queue = asyncio.Queue(self.max_queue)
+            self.task = asyncio.ensure_future(self._worker())
+
+        future = asyncio.get_running_loop().create_future()
+        item = source, kwargs, future
+        if self.block:
+            await self.queue.put(item)
+        else:
+            self.queue.put_nowait(item)
+        return await future
+
+    async def close(self):
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+        # Nobody is going to process the rest
+        while not self.queue.empty():
+            *_, future = self.queue.get_nowait()
+            future.cancel()
+
+    async def _worker(self):
+        while True:
+            batch = await self._collect()
+            for kwargs, items in self._group(batch):
+                await self._process(kwargs, items)
+
+    async def _collect(self) -> List[tuple]:
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.delay
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+        return batch
+
+    @staticmethod
+    def _group(batch: List[tuple]) -> List[tuple]:
+        """
+        Groups calls by arguments. Arguments may not be hashable
+        (escape phrases are lists) so they are compared one by one.
+        """
+
+        groups = []
+        for source, kwargs, future in batch:
+            for group_kwargs, items in groups:
+                if group_kwargs == kwargs:
+                    items.append((source, future))
+                    break
+            else:
+                groups.append((kwargs, [(source, future)]))
+        return groups
+
+    async def _process(self, kwargs: dict, items: List[tuple]):
+        loop = asyncio.get_running_loop()
+        texts = [source for source, _ in items]
+        try:
+            results = await loop.run_in_executor(
+                None, partial(self.run, texts, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
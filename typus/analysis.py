@@ -0,0 +1,385 @@
+"""
+Static analysis of compiled expressions. Finds out which characters
+a rule matches, looks at and puts into the text, so passes which
+can't match are skipped.
+"""
+
+import re
+import string
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Iterable, List, NamedTuple, Optional, Union
+
+try:
+    from re import _constants as sre_constants
+    from re import _parser as sre_parse
+except ImportError:  # pragma: nocover
+    import sre_constants
+    import sre_parse
+
+__all__ = (
+    'Gate',
+    'RuleInfo',
+    'analyse',
+    'separates',
+)
+
+CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r'\d',
+    sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s',
+    sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w',
+    sre_constants.CATEGORY_NOT_WORD: r'\W',
+}
+
+CHARSETS = (
+    sre_constants.LITERAL,
+    sre_constants.NOT_LITERAL,
+    sre_constants.ANY,
+    sre_constants.IN,
+)
+
+REPEATS = (
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, 'POSSESSIVE_REPEAT', None),
+)
+
+# Typical characters to estimate how often charsets match,
+# spaces are the most common ones
+PROBE = (
+    string.ascii_letters + string.digits + string.punctuation + ' ' * 16 + '\n'
+    + 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+    + 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+)
+
+# Replace template tokens: escaped slash, group references, everything else
+RE_TEMPLATE = re.compile(r'\\\\|\\g<([1-9]\d*)>|\\([1-9]\d?)|\\|[^\\]+')
+
+Template = List[Union[str, int]]
+
+
+class Unsupported(Exception):
+    pass
+
+
+class Charset(NamedTuple):
+    """
+    A set of characters a single regex item matches.
+    """
+
+    pattern: str
+    flags: int
+
+    def members(self, alphabet: Iterable[str]) -> frozenset:
+        match = re.compile(self.pattern, self.flags).fullmatch
+        return frozenset(c for c in alphabet if match(c))
+
+
+class RuleInfo(NamedTuple):
+    """
+    Describes a single compiled expression. Charsets are tuples
+    of :class:`Charset`, ``None`` means any character.
+
+    :param name: Expression name and index, like ``mdash[1]``
+    :param pattern: Compiled pattern
+    :param replace: Replace string or function
+    :param matches: Characters the rule may consume
+    :param ahead: Characters lookaheads may look at
+    :param behind: Characters lookbehinds may look at
+    :param anchors: ``True`` if checks line or text boundaries
+    :param triggers: Characters every match contains one of,
+        ``None`` if unknown
+    :param puts: Characters the replacement adds to the text,
+        ``None`` if unknown
+    :param error: The reason the rule can't be analysed or ``None``
+    """
+
+    name: str
+    pattern: 're.Pattern'
+    replace: Union[str, Callable]
+    matches: tuple = ()
+    ahead: tuple = ()
+    behind: tuple = ()
+    anchors: bool = False
+    triggers: Optional[tuple] = None
+    puts: Optional[str] = None
+    error: Optional[str] = None
+
+
+class Collector:
+    """
+    Collects charsets while walking the parsed pattern.
+    """
+
+    def __init__(self):
+        self.matches = []
+        self.ahead = []
+        self.behind = []
+        self.anchors = False
+
+
+def _escape(char: int) -> str:
+    return re.escape(chr(char))
+
+
+def _item(op, av) -> str:
+    if op is sre_constants.LITERAL:
+        return _escape(av)
+    if op is sre_constants.RANGE:
+        return '{0}-{1}'.format(_escape(av[0]), _escape(av[1]))
+    if op is sre_constants.CATEGORY:
+        return CATEGORIES[av]
+    raise Unsupported('unsupported set item {0}'.format(op))
+
+
+def _charset(op, av, flags: int) -> Charset:
+    if op is sre_constants.LITERAL:
+        pattern = _escape(av)
+    elif op is sre_constants.NOT_LITERAL:
+        pattern = '[^{0}]'.format(_escape(av))
+    elif op is sre_constants.ANY:
+        pattern = '.'
+    elif op is sre_constants.IN:
+        negate = av and av[0][0] is sre_constants.NEGATE
+        items = ''.join(_item(*item) for item in av[negate:])
+        pattern = '[{0}{1}]'.format('^' if negate else '', items)
+    else:
+        raise Unsupported('unsupported item {0}'.format(op))
+    return Charset(pattern, flags)
+
+
+def _walk(data, flags: int, found: Collector, sides=None):
+    """
+    Walks the parsed sequence and collects charsets it consumes.
+    Items within lookarounds are put into ``sides``.
+    """
+
+    for op, av in data:
+        walker = WALKERS.get(op)
+        if walker is None:
+            raise Unsupported('unsupported item {0}'.format(op))
+        walker(op, av, flags, found, sides)
+
+
+def _walk_charset(op, av, flags: int, found: Collector, sides):
+    charset = _charset(op, av, flags)
+    for target in sides or (found.matches, ):
+        target.append(charset)
+
+
+def _walk_subpattern(_, av, flags: int, found: Collector, sides):
+    _, add_flags, del_flags, sub = av
+    _walk(sub, (flags | add_flags) & ~del_flags, found, sides)
+
+
+def _walk_repeat(_, av, flags: int, found: Collector, sides):
+    _walk(av[2], flags, found, sides)
+
+
+def _walk_atomic(_, av, flags: int, found: Collector, sides):
+    _walk(av, flags, found, sides)
+
+
+def _walk_branch(_, av, flags: int, found: Collector, sides):
+    for branch in av[1]:
+        _walk(branch, flags, found, sides)
+
+
+def _walk_assert(_, av, flags: int, found: Collector, sides):
+    direction, sub = av
+    side = found.ahead if direction > 0 else found.behind
+    # Nested lookarounds may look anywhere
+    _walk(sub, flags, found,
+          (found.ahead, found.behind) if sides else (side, ))
+
+
+def _walk_at(_, av, _flags, found: Collector, _sides):
+    if av in (sre_constants.AT_BEGINNING, sre_constants.AT_END,
+              sre_constants.AT_BEGINNING_STRING,
+              sre_constants.AT_END_STRING):
+        found.anchors = True
+
+
+def _walk_groupref(*args):
+    raise Unsupported('backreferences')
+
+
+# Walkers of parsed items, see :func:`_walk`
+WALKERS = dict(chain(
+    ((op, _walk_charset) for op in CHARSETS),
+    ((op, _walk_repeat) for op in REPEATS if op is not None),
+    ((
+        (sre_constants.SUBPATTERN, _walk_subpattern),
+        (getattr(sre_constants, 'ATOMIC_GROUP', None), _walk_atomic),
+        (sre_constants.BRANCH, _walk_branch),
+        (sre_constants.ASSERT, _walk_assert),
+        (sre_constants.ASSERT_NOT, _walk_assert),
+        (sre_constants.AT, _walk_at),
+        (sre_constants.GROUPREF, _walk_groupref),
+        (sre_constants.GROUPREF_EXISTS, _walk_groupref),
+    )),
+))
+WALKERS.pop(None, None)
+
+
+@lru_cache(maxsize=None)
+def _frequency(charset: Charset) -> int:
+    match = re.compile(charset.pattern, charset.flags).fullmatch
+    return sum(1 for char in PROBE if match(char))
+
+
+def _rarity(charsets: tuple) -> int:
+    return sum(map(_frequency, charsets))
+
+
+def _required(data, flags: int) -> List[tuple]:
+    """
+    Returns tuples of charsets, every match contains a character
+    of each tuple.
+    """
+
+    required = []
+    for op, av in data:
+        if op in CHARSETS:
+            required.append((_charset(op, av, flags), ))
+        elif op is sre_constants.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            required.extend(_required(sub, (flags | add_flags) & ~del_flags))
+        elif op in REPEATS:
+            low, _, sub = av
+            if low:
+                required.extend(_required(sub, flags))
+        elif op is getattr(sre_constants, 'ATOMIC_GROUP', None):
+            required.extend(_required(av, flags))
+        elif op is sre_constants.BRANCH:
+            # Any branch may match, so takes one tuple from each
+            branches = [_required(x, flags) for x in av[1]]
+            if all(branches):
+                required.append(tuple(chain(
+                    *(min(x, key=_rarity) for x in branches))))
+        elif op is sre_constants.ASSERT:
+            # Positive lookarounds need characters around the match
+            required.extend(_required(av[1], flags))
+    return required
+
+
+def _template(replace: str) -> Template:
+    """
+    Splits replace string into literals and group numbers.
+    """
+
+    template = []
+    for match in RE_TEMPLATE.finditer(replace):
+        token, *groups = match.group(0, 1, 2)
+        number = groups[0] or groups[1]
+        if number:
+            template.append(int(number))
+        elif token == '\\\\':
+            template.append('\\')
+        elif token.startswith('\\'):
+            raise Unsupported('unsupported replace escape')
+        else:
+            template.append(token)
+    return template
+
+
+def _puts(replace: Union[str, Callable]) -> Optional[str]:
+    if isinstance(replace, str):
+        # Groups put back what the text already has
+        return ''.join(
+            x for x in _template(replace) if isinstance(x, str))
+
+    # Functions may declare what they put, see :func:`typus.utils.map_choices`
+    choices = getattr(replace, 'outputs', None)
+    return None if choices is None else ''.join(choices)
+
+
+def analyse(name: str, pattern: 're.Pattern',
+            replace: Union[str, Callable]) -> RuleInfo:
+    """
+    Collects characters the rule matches, looks at and puts.
+    """
+
+    info = RuleInfo(name, pattern, replace)
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+        if parsed.getwidth()[0] == 0:
+            raise Unsupported('matches empty string')
+
+        found = Collector()
+        _walk(parsed.data, pattern.flags, found)
+        required = _required(parsed.data, pattern.flags)
+        puts = _puts(replace)
+    except (Unsupported, re.error, KeyError) as exc:
+        return info._replace(error=str(exc) or 'unsupported')
+
+    return info._replace(
+        matches=tuple(found.matches),
+        ahead=tuple(found.ahead), behind=tuple(found.behind),
+        anchors=found.anchors,
+        triggers=min(required, key=_rarity) if required else None,
+        puts=puts)
+
+
+def separates(rule: RuleInfo, separator: str) -> bool:
+    """
+    Returns ``True`` if the rule never matches or looks at the separator
+    and doesn't check text boundaries, so texts joined with it are
+    processed as if they were apart.
+    """
+
+    if rule.error or rule.anchors:
+        return False
+    return not any(
+        charset is None or charset.members(separator)
+        for charset in chain(rule.matches, rule.ahead, rule.behind))
+
+
+class Gate:
+    r"""
+    Maps characters to bit masks of passes they may trigger.
+    Every pass is given as a tuple of charsets or ``None``
+    if it must always run.
+
+    >>> from typus.analysis import Charset, Gate
+    >>> gate = Gate([(Charset(r'\d', 0), ), None])
+    >>> gate.mask('foo'), gate.mask('f00')
+    (2, 3)
+    """
+
+    # Forgets seen characters when there are too many of them
+    maxsize = 2 ** 16
+
+    def __init__(self, triggers: Iterable[Optional[tuple]]):
+        self.always = 0
+        self.matchers = []
+        for index, charsets in enumerate(triggers):
+            if charsets is None:
+                self.always |= 1 << index
+                continue
+            for charset in charsets:
+                match = re.compile(charset.pattern, charset.flags).fullmatch
+                self.matchers.append((1 << index, match))
+        self.table = {}
+
+    def mask(self, chars: Iterable[str]) -> int:
+        table = self.table
+        mask = self.always
+        for char in chars:
+            try:
+                mask |= table[char]
+            except KeyError:
+                mask |= self._learn(char)
+        return mask
+
+    def _learn(self, char: str) -> int:
+        if len(self.table) >= self.maxsize:
+            self.table.clear()
+        mask = 0
+        for bit, match in self.matchers:
+            if match(char):
+                mask |= bit
+        self.table[char] = mask
+        return mask
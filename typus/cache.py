@@ -0,0 +1,126 @@
+import sys
+from collections import Counter, OrderedDict, namedtuple
+from threading import Lock
+from typing import Hashable, Optional
+
+__all__ = ('CacheInfo', 'ResultCache')
+
+CacheInfo = namedtuple(
+    'CacheInfo', 'hits misses evictions size bytes maxsize maxbytes')
+
+
+def freeze(value):
+    """
+    Makes the value hashable if possible.
+    """
+
+    if isinstance(value, (list, tuple)):
+        return tuple(map(freeze, value))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(map(freeze, value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ResultCache:
+    """
+    Bounded LRU cache for :class:`typus.core.TypusCore` results.
+
+    :param int maxsize: Maximum number of results to keep
+    :param int maxbytes: Maximum total size of keys and results in bytes,
+        no limit if ``None``. Larger results are never stored.
+    :param int admit_after: Number of misses before the result is stored.
+        Values greater than one keep texts seen once out of the cache.
+
+    >>> from typus import EnTypus
+    >>> from typus.cache import ResultCache
+    >>> en_typus = EnTypus(cache=ResultCache(maxsize=100))
+    >>> en_typus('"foo"'), en_typus('"foo"')
+    ('“foo”', '“foo”')
+    >>> info = en_typus.cache.info()
+    >>> info.hits, info.misses, info.size
+    (1, 1, 1)
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = None,
+                 admit_after: int = 1):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.admit_after = admit_after
+        self.hits = self.misses = self.evictions = self.bytes = 0
+        self._data = OrderedDict()
+        self._seen = Counter()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def key(source: str, debug: bool, kwargs: dict,
+            typus: type = None) -> Optional[Hashable]:
+        """
+        Returns the key for the call or ``None`` if the call
+        can't be cached. Typus class is a part of the key, so typuses
+        of different languages can share the cache.
+        """
+
+        key = source, debug, freeze(kwargs), typus
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: str):
+        size = self._sizeof(key, value)
+        if self.maxbytes is not None and size > self.maxbytes:
+            # Would evict everything else and then itself
+            return
+
+        with self._lock:
+            if self.admit_after > 1:
+                self._seen[key] += 1
+                if self._seen[key] < self.admit_after:
+                    # Forgets history instead of growing forever
+                    if len(self._seen) > self.maxsize:
+                        self._seen.clear()
+                    return
+                del self._seen[key]
+
+            if key in self._data:
+                return
+
+            self._data[key] = value
+            self.bytes += size
+            while len(self._data) > self.maxsize or (
+                    self.maxbytes is not None and self.bytes > self.maxbytes):
+                old_key, old_value = self._data.popitem(last=False)
+                self.bytes -= self._sizeof(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._seen.clear()
+            self.hits = self.misses = self.evictions = self.bytes = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self._data),
+            self.bytes, self.maxsize, self.maxbytes)
+
+    @staticmethod
+    def _sizeof(key: tuple, value: str) -> int:
+        return sys.getsizeof(key[0]) + sys.getsizeof(value)
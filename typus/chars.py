@@ -5,6 +5,7 @@ __all__ = (
     'LAQUO',
     'LDQUO',
     'LSQUO',
+    'MARKERS',
     'MDASH',
     'MDASH_PAIR',
     'MINUS',
@@ -44,3 +45,7 @@ RAQUO = '»'  # right angle quote marks
 
 SPRIME = '′'
 DPRIME = '″'
+
+# Private use area characters escape keys start and end with,
+# see :class:`typus.processors.BaseEscapeProcessor`
+MARKERS = r'[\ue000-\ue0ff]'
@@ -0,0 +1,205 @@
+"""
+Typesets files in bulk::
+
+    python -m typus --lang ru --in-place docs/
+    python -m typus --no-html --output build/ notes.txt
+    python -m typus < notes.txt > notes.typus.txt
+
+Directories are searched for files matching ``--glob`` patterns.
+Small files are processed in batches, large ones are memory-mapped
+and split at safe paragraph breaks, see :meth:`typus.pool.TypusPool.process`.
+Both go to a pool of processes. Spaces around the text of a file,
+like the last line break, are kept.
+"""
+
+import argparse
+import mmap
+import os
+import shutil
+import sys
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+
+from .core import TypusCore
+from .factory import from_config
+from .phrases import PhraseSet, compile_phrases
+from .pool import TypusPool
+
+__all__ = ('main', )
+
+# Files of this size are memory-mapped and split into paragraphs
+LARGE_FILE = 2 ** 20
+
+# Total size of small files sent to the pool at once
+BATCH_SIZE = 2 ** 24
+
+PATTERNS = ('*.html', '*.htm', '*.md', '*.txt')
+
+
+def build_typus(lang: str, html: bool = True) -> TypusCore:
+    config = {'lang': lang}
+    if not html:
+        config['escape_html'] = False
+    return from_config(config)
+
+
+def load_phrases(phrases: List[str],
+                 files: List[str]) -> Optional[PhraseSet]:
+    """
+    Collects phrases given as is and ones from files, a phrase per line.
+    """
+
+    phrases = list(phrases)
+    for path in files:
+        with open(path, encoding='utf-8') as file:
+            phrases.extend(line.rstrip('\r\n') for line in file)
+    return compile_phrases(phrases) if phrases else None
+
+
+def find_files(paths: List[str],
+               patterns: List[str]) -> Iterator[Tuple[Path, Path]]:
+    """
+    Yields files and their paths relative to the output directory.
+    """
+
+    for name in paths:
+        path = Path(name)
+        if not path.is_dir():
+            yield path, relative_path(path)
+            continue
+        found = {
+            source for pattern in patterns
+            for source in path.rglob(pattern) if source.is_file()}
+        for source in sorted(found):
+            yield source, source.relative_to(path)
+
+
+def relative_path(path: Path) -> Path:
+    # Files keep their directories, so equal names don't clash
+    relative = Path(os.path.relpath(str(path)))
+    if relative.parts[:1] == ('..', ):
+        resolved = path.resolve()
+        relative = resolved.relative_to(resolved.anchor)
+    return relative
+
+
+def read(path: Path, encoding: str) -> str:
+    if path.stat().st_size < LARGE_FILE:
+        return path.read_bytes().decode(encoding)
+
+    # Decodes the mapped file, bytes aren't copied into memory first
+    with open(str(path), 'rb') as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return str(mapped, encoding)
+
+
+def write(path: Path, text: str, encoding: str):
+    # Written next to the file first, so it's never left half written
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name('.{0}.typus'.format(path.name))
+    with open(str(temp), 'w', encoding=encoding, newline='',
+              buffering=2 ** 16) as file:
+        file.write(text)
+    if path.exists():
+        shutil.copymode(str(path), str(temp))
+    os.replace(str(temp), str(path))
+
+
+def wrap(source: str, processed: str) -> str:
+    # Puts back spaces typus strips
+    start = len(source) - len(source.lstrip())
+    end = len(source.rstrip())
+    if start >= end:
+        return source
+    return source[:start] + processed + source[end:]
+
+
+def typeset(pool: TypusPool, files: List[Tuple[Path, Path]],
+            output: Optional[Path], encoding: str, errors: IO[str],
+            **kwargs) -> int:
+    """
+    Typesets files and returns the number of failed ones.
+    """
+
+    failed = 0
+    batch, size = [], 0
+
+    def flush():
+        processed = pool.map([text for _, text in batch], **kwargs)
+        for (target, text), result in zip(batch, processed):
+            write(target, wrap(text, result), encoding)
+        batch.clear()
+
+    for source, relative in files:
+        target = source if output is None else output / relative
+        try:
+            text = read(source, encoding)
+        except (OSError, ValueError) as exc:
+            errors.write('{0}: {1}\n'.format(source, exc))
+            failed += 1
+            continue
+
+        if len(text) >= LARGE_FILE:
+            write(target, wrap(text, pool.process(text, **kwargs)), encoding)
+            continue
+
+        batch.append((target, text))
+        size += len(text)
+        if size >= BATCH_SIZE:
+            flush()
+            size = 0
+
+    if batch:
+        flush()
+    return failed
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m typus', description='Typesets files in bulk.')
+    parser.add_argument(
+        'paths', nargs='*',
+        help='files or directories, reads stdin and writes stdout if none')
+    parser.add_argument('--lang', choices=('en', 'ru'), default='en')
+    parser.add_argument(
+        '--no-html', dest='html', action='store_false',
+        help="doesn't skip html tags")
+    parser.add_argument(
+        '-p', '--escape-phrase', action='append', default=[],
+        metavar='PHRASE', help='phrase to keep as is')
+    parser.add_argument(
+        '--escape-phrases', action='append', default=[], metavar='FILE',
+        help='file of phrases to keep as is, a phrase per line')
+    parser.add_argument(
+        '--glob', action='append', metavar='PATTERN',
+        help='files to look for in directories, default: {0}'.format(
+            ' '.join(PATTERNS)))
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        '-i', '--in-place', action='store_true', help='overwrites files')
+    target.add_argument(
+        '-o', '--output', type=Path, metavar='DIR',
+        help='writes files into the directory')
+    parser.add_argument('-j', '--jobs', type=int, help='number of processes')
+    parser.add_argument('--encoding', default='utf-8')
+    args = parser.parse_args(argv)
+
+    if args.paths and not (args.in_place or args.output):
+        parser.error('either --in-place or --output is required')
+
+    typus = build_typus(args.lang, args.html)
+    kwargs = {}
+    phrases = load_phrases(args.escape_phrase, args.escape_phrases)
+    if phrases is not None:
+        kwargs['escape_phrases'] = phrases
+
+    with TypusPool(typus, executor='process', workers=args.jobs) as pool:
+        if not args.paths:
+            text = sys.stdin.read()
+            sys.stdout.write(wrap(text, pool.process(text, **kwargs)))
+            return 0
+
+        files = list(find_files(args.paths, args.glob or PATTERNS))
+        failed = typeset(
+            pool, files, args.output, args.encoding, sys.stderr, **kwargs)
+    return 1 if failed else 0
@@ -0,0 +1,157 @@
+"""
+Typesets columns of tables: NumPy arrays, pandas series and pyarrow
+string arrays. Instead of calling typus for every row, like
+``series.map(en_typus)`` does, distinct values are found first,
+every one is processed once and results are put back by index::
+
+    from typus.columnar import apply
+    df['title'] = apply(df['title'], ru_typus)
+
+None of the libraries is required by typus, the one the column
+belongs to is imported on the first call.
+"""
+
+from functools import partial
+from typing import Callable
+
+from . import en_typus
+from .core import TypusCore
+from .pool import TypusPool
+
+__all__ = ('apply', )
+
+
+def apply(array, typus: TypusCore = en_typus, *, pool: TypusPool = None,
+          **kwargs):
+    """
+    Processes every distinct string of the column once and returns
+    a column of the same type and shape. Values which aren't strings,
+    like ``None`` and ``NaN``, are left as is.
+
+    :param array: NumPy array of strings or objects, pandas series,
+        pyarrow string or dictionary array, chunked or not
+    :param typus: :class:`typus.core.TypusCore` instance to run
+    :param pool: Optional :class:`typus.pool.TypusPool` to run on
+    :param kwargs: Optional settings passed to typus
+    """
+
+    run = partial((pool or typus).map, **kwargs)
+    library = type(array).__module__.partition('.')[0]
+    try:
+        handler = HANDLERS[library]
+    except KeyError:
+        handler = None
+    if handler is not None:
+        processed = handler(array, run)
+        if processed is not None:
+            return processed
+    raise ValueError('Unknown array type "{0}".'.format(
+        type(array).__name__))
+
+
+def _strings(values):
+    """
+    Returns a mask of string items of the NumPy object array.
+    """
+
+    import numpy
+    return numpy.frompyfunc(isinstance, 2, 1)(values, str).astype(bool)
+
+
+def _apply_objects(values, run: Callable):
+    """
+    Processes strings of the NumPy object array of distinct values
+    in place.
+    """
+
+    mask = _strings(values)
+    if mask.any():
+        values[mask] = run(values[mask].tolist())
+    return values
+
+
+def _apply_numpy(array, run: Callable):
+    import numpy
+
+    if array.dtype.kind in 'UT':
+        # Results may be longer, fixed width strings are widened
+        dtype = str if array.dtype.kind == 'U' else array.dtype
+        values, inverse = numpy.unique(array, return_inverse=True)
+        processed = numpy.array(run(values.tolist()), dtype=dtype)
+        return processed[inverse].reshape(array.shape)
+
+    if array.dtype.kind != 'O':
+        return None
+
+    mask = _strings(array)
+    values, inverse = numpy.unique(array[mask], return_inverse=True)
+    processed = array.copy()
+    processed[mask] = _apply_objects(values, run)[inverse]
+    return processed
+
+
+def _apply_pandas(series, run: Callable):
+    import numpy
+    import pandas
+
+    if not isinstance(series, pandas.Series):
+        return None
+
+    # Empty and all-null series have nothing to process
+    if not series.notna().any():
+        return series.copy()
+
+    if isinstance(series.dtype, pandas.CategoricalDtype):
+        # Only categories are processed, equal results are merged
+        categorical = series.array
+        values = _apply_objects(categorical.categories.to_numpy(
+            dtype=object, copy=True), run)
+        codes, categories = pandas.factorize(values)
+        processed = pandas.Categorical.from_codes(
+            numpy.where(categorical.codes < 0, -1, codes[categorical.codes]),
+            categories=categories, ordered=categorical.ordered)
+        return pandas.Series(processed, index=series.index, name=series.name)
+
+    # Missing values get the code -1, they are kept as is
+    codes, uniques = pandas.factorize(series)
+    values = _apply_objects(uniques.to_numpy(dtype=object, copy=True), run)
+    return series.where(codes < 0, values.take(codes, mode='wrap'))
+
+
+def _apply_pyarrow(array, run: Callable):
+    import pyarrow
+    import pyarrow.compute
+
+    value_type = getattr(array.type, 'value_type', array.type)
+    if not (pyarrow.types.is_string(value_type)
+            or pyarrow.types.is_large_string(value_type)):
+        return None
+
+    if isinstance(array, pyarrow.ChunkedArray):
+        if pyarrow.types.is_dictionary(array.type):
+            return pyarrow.chunked_array(
+                [_apply_pyarrow(chunk, run) for chunk in array.chunks],
+                type=array.type)
+    elif not isinstance(array, pyarrow.Array):
+        return None
+
+    if pyarrow.types.is_dictionary(array.type):
+        # Already encoded, the dictionary is processed only
+        dictionary = array.dictionary
+        processed = pyarrow.array(
+            run(dictionary.to_pylist()), type=dictionary.type)
+        return pyarrow.DictionaryArray.from_arrays(array.indices, processed)
+
+    values = pyarrow.compute.unique(pyarrow.compute.drop_null(array))
+    if isinstance(values, pyarrow.ChunkedArray):
+        values = values.combine_chunks()
+    indices = pyarrow.compute.index_in(array, value_set=values)
+    processed = pyarrow.array(run(values.to_pylist()), type=values.type)
+    return pyarrow.compute.take(processed, indices)
+
+
+HANDLERS = {
+    'numpy': _apply_numpy,
+    'pandas': _apply_pandas,
+    'pyarrow': _apply_pyarrow,
+}
@@ -1,39 +1,356 @@
 # pylint: disable=unused-argument, method-hidden
 
-from functools import update_wrapper
+from functools import partial, update_wrapper
+from typing import IO, TYPE_CHECKING, Iterable, List, Tuple, Union
 
-from .chars import NBSP, NNBSP
-from .utils import re_compile
+from .chars import ANYSP, NBSP, NNBSP
+from .utils import lazy_attribute, re_compile
+
+if TYPE_CHECKING:  # pragma: nocover
+    from concurrent.futures import Executor
+
+    from .cache import ResultCache
+    from .editor import Editor
+    from .profiler import Profiler, Trace
+    from .stream import Stream
+    from .telemetry import Telemetry
 
 __all__ = ('TypusCore', )
 
 
 class TypusCore:
-    """
+    r"""
     This class runs :mod:`typus.processors` chained together.
+    Processors are built on first use, so instances are cheap to create.
+
+    Texts longer than ``max_input_size`` characters are handled by
+    the ``oversize`` policy:
+
+    - ``'split'`` processes them at safe paragraph breaks in parts
+      of the size, see :class:`typus.stream.Stream`, quotes left
+      unclosed in a part aren't paired with the next one,
+    - ``'ignore'`` returns them as is,
+    - ``'raise'`` raises :class:`ValueError`.
+
+    >>> from typus import EnTypus
+    >>> class MyTypus(EnTypus):
+    ...     max_input_size = 8
+    >>> MyTypus()('"foo"\n\n(c) bar')
+    '“foo”\n\n©\xa0bar'
     """
 
     processors = ()
+    cache = None
+    telemetry = None
+    max_input_size = None
+    oversize = 'split'
     re_nbsp = re_compile('[{}{}]'.format(NBSP, NNBSP))
+    re_paragraph = re_compile(r'\r?\n(?:{0}*\r?\n)+'.format(ANYSP))
 
-    def __init__(self):
+    def __init__(self, *, cache: 'ResultCache' = None,
+                 telemetry: 'Telemetry' = None):
         assert self.processors, 'Empty typus. Set processors'
+        if self.oversize not in ('split', 'ignore', 'raise'):
+            raise ValueError(
+                'Unknown oversize policy "{0}".'.format(self.oversize))
 
         # Makes possible to decorate Typus.
         # updated=() skips __dict__ attribute
         update_wrapper(self, self.__class__, updated=())
 
+        # Opt-in results cache, see :class:`typus.cache.ResultCache`
+        if cache is not None:
+            self.cache = cache
+
+        # Opt-in telemetry, see :class:`typus.telemetry.Telemetry`
+        if telemetry is not None:
+            self.telemetry = telemetry
+
+    @lazy_attribute
+    def procs(self):
         # Chains all processors into one single function
-        self.procs = sum(p(self) for p in reversed(self.processors))
+        return sum(p(self) for p in reversed(self.processors))
 
     def __call__(self, source: str, *, debug=False, **kwargs):
+        telemetry = self.telemetry
+        if telemetry is not None:
+            return telemetry.observe(self, source, debug, kwargs)
+        return self._call(source, debug, kwargs)
+
+    def _call(self, source: str, debug: bool, kwargs: dict) -> str:
+        cache = self.cache
+        if cache is None:
+            return self._process(source, debug, kwargs)
+
+        key = cache.key(source, debug, kwargs, type(self))
+        if key is None:
+            return self._process(source, debug, kwargs)
+
+        processed = cache.get(key)
+        if processed is None:
+            processed = self._process(source, debug, kwargs)
+            cache.set(key, processed)
+        return processed
+
+    def trace(self, source: str, *, debug=False, stages=True,
+              **kwargs) -> 'Trace':
+        """
+        Works as :meth:`__call__` but tells whether the result was taken
+        from the cache and how long every processor and expressions pass
+        took. Unlike :meth:`profile` other calls aren't measured.
+        Timing of stages makes the call a few times slower, set
+        ``stages=False`` to skip it. See :class:`typus.profiler.Trace`.
+
+        >>> from typus import en_typus
+        >>> trace = en_typus.trace('"foo"')
+        >>> trace.text, trace.cached
+        ('“foo”', None)
+        >>> sorted(stage.name for stage in trace.stages)[:2]
+        ['EnQuotes', 'EnRuExpressions']
+        """
+
+        from .profiler import Trace, Tracer
+
+        cache = self.cache
+        key = None
+        if cache is not None:
+            key = cache.key(source, debug, kwargs, type(self))
+        if key is not None:
+            processed = cache.get(key)
+            if processed is not None:
+                return Trace(processed, True, [])
+
+        tracer = None
+        if stages:
+            tracer = Tracer()
+            kwargs = dict(kwargs, tracer=tracer)
+        processed = self._process(source, debug, kwargs)
+        if key is not None:
+            cache.set(key, processed)
+        return Trace(processed, None if key is None else False,
+                     [] if tracer is None else tracer.stats())
+
+    def _process(self, source: str, debug: bool, kwargs: dict) -> str:
         text = source.strip()
         if not text:
             return ''
 
+        limit = self.max_input_size
+        if limit is not None and len(text) > limit:
+            return self._process_oversize(text, debug, kwargs)
+
         # All the magic
-        processed = self.procs.run(text, debug=debug, **kwargs)
+        return self.process_part(text, debug=debug, **kwargs)
+
+    def _process_oversize(self, text: str, debug: bool, kwargs: dict) -> str:
+        if self.oversize == 'ignore':
+            return text
+        if self.oversize == 'raise':
+            raise ValueError('Text of {0} characters exceeds {1}.'.format(
+                len(text), self.max_input_size))
+
+        # Chunks of a half of the window make the stream split
+        # the text as soon as possible
+        size = max(self.max_input_size // 2, 1)
+        chunks = (text[i:i + size] for i in range(0, len(text), size))
+        return ''.join(self.stream(
+            chunks, window=self.max_input_size, debug=debug, **kwargs))
+
+    def process_part(self, text: str, *, debug=False, **kwargs) -> str:
+        r"""
+        Processes a part of a bigger text split right after a break
+        (see :meth:`breaks`). Unlike :meth:`__call__` spaces around
+        aren't stripped and results aren't cached, so parts joined
+        together give the same the whole text does.
+
+        >>> from typus import en_typus
+        >>> text = '"foo" (c)  \n\n\tbar'
+        >>> en_typus.process_part(text[:13]), en_typus.process_part(text[13:])
+        ('“foo” ©\n\n', '\tbar')
+        >>> en_typus(text)
+        '“foo” ©\n\n\tbar'
+        """
+
+        # Records the call, see :meth:`trace`
+        tracer = kwargs.get('tracer')
+        if tracer is not None:
+            processed = tracer.run(self.procs, text, debug=debug, **kwargs)
+        else:
+            processed = self.procs.run(text, debug=debug, **kwargs)
+        return self._finalize(processed, debug)
+
+    def process_bytes(self, data: Union[bytes, bytearray, memoryview], *,
+                      encoding: str = 'utf-8', **kwargs) -> bytes:
+        r"""
+        Works as :meth:`__call__` but takes and returns encoded text,
+        like bodies of http requests. A payload typus doesn't change is
+        returned as is, without encoding it back.
+
+        >>> from typus import en_typus
+        >>> en_typus.process_bytes(b'"foo" (c)')
+        b'\xe2\x80\x9cfoo\xe2\x80\x9d \xc2\xa9'
+        >>> data = b'foo'
+        >>> en_typus.process_bytes(data) is data
+        True
+        """
+
+        # Decoding takes buffers as is, no copy of a memoryview is made
+        text = str(data, encoding)
+        processed = self(text, **kwargs)
+        if processed == text:
+            return data if isinstance(data, bytes) else bytes(data)
+        return processed.encode(encoding)
+
+    async def aprocess(self, source: str, *, executor: 'Executor' = None,
+                       **kwargs) -> str:
+        """
+        Runs typus in the ``executor`` and doesn't block the event loop.
+        Uses loop's default executor if ``None`` is given.
+
+        >>> import asyncio
+        >>> from typus import en_typus
+        >>> asyncio.run(en_typus.aprocess('"foo"'))
+        '“foo”'
+        """
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, partial(self, source, **kwargs))
+
+    def __reduce__(self):
+        # Processors hold compiled patterns and closures, it's cheaper
+        # and safer to build them again in the other process
+        return self.__class__, ()
+
+    def map(self, texts: Iterable[str], *, debug=False, **kwargs) -> List[str]:
+        """
+        Processes a batch of texts and returns results in the same order.
+        Every distinct text is processed only once, duplicates reuse
+        the result. With no cache and input limit, texts go through
+        the processors all at once, see
+        :meth:`typus.processors.BaseProcessor.run_batch`.
+
+        >>> from typus import en_typus
+        >>> en_typus.map(['"foo"', '(c)', '"foo"'])
+        ['“foo”', '©', '“foo”']
+        """
+
+        kwargs = self.prepare(kwargs)
+        if self.cache is None and self.max_input_size is None:
+            texts = [source.strip() for source in texts]
+            unique = [text for text in dict.fromkeys(texts) if text]
+            processed = self.procs.run_batch(unique, debug=debug, **kwargs)
+            done = {
+                text: self._finalize(result, debug)
+                for text, result in zip(unique, processed)
+            }
+            done[''] = ''
+            return [done[text] for text in texts]
+
+        process = partial(self, debug=debug, **kwargs)
+        done = {}
+        results = []
+        for source in texts:
+            text = source.strip()
+            try:
+                processed = done[text]
+            except KeyError:
+                processed = done[text] = process(text)
+            results.append(processed)
+        return results
+
+    def stream(self, chunks: Union[Iterable[str], IO[str]], *,
+               window: int = 2 ** 20, **kwargs) -> 'Stream':
+        r"""
+        Processes text given in chunks and yields results as soon as
+        safe paragraph break is found. See :class:`typus.stream.Stream`.
+
+        >>> from typus import en_typus
+        >>> ''.join(en_typus.stream(['"foo"\n', '\nbar', ' (c)']))
+        '“foo”\n\nbar ©'
+        """
+
+        from .stream import Stream
+        return Stream(self, chunks, window=window, **kwargs)
+
+    def editor(self, source: str = '', **kwargs) -> 'Editor':
+        r"""
+        Returns an editor which processes again only paragraphs changed
+        by an edit and maps positions between the source and the output.
+        See :class:`typus.editor.Editor`.
+
+        >>> from typus import en_typus
+        >>> editor = en_typus.editor('foo -- bar')
+        >>> editor.update(0, 3, '"baz"')
+        '“baz”\u202f—\u2009bar'
+        """
+
+        from .editor import Editor
+        return Editor(self, source, **kwargs)
+
+    def profile(self) -> 'Profiler':
+        """
+        Returns a profiler of processors and expressions,
+        see :class:`typus.profiler.Profiler`.
+        """
+
+        from .profiler import Profiler
+        return Profiler(self)
+
+    def breaks(self, text: str, *, complete: bool = True,
+               **kwargs) -> List[Tuple[int, int]]:
+        r"""
+        Returns spans of paragraph breaks which don't split anything
+        processors handle as a whole, like html blocks or quotes.
+        Text can be processed paragraph by paragraph at those breaks.
+        Pass ``complete=False`` if the text is followed by unknown yet rest.
+
+        >>> from typus import en_typus
+        >>> en_typus.breaks('foo\n\n"bar\n\nbaz"')
+        [(3, 5)]
+        """
+
+        # Every processor sees the text the way it's given to it,
+        # parts escaped before are hidden
+        atomic = []
+        visible = text
+        for processor in self.procs:
+            spans = list(
+                processor.atomic(visible, complete=complete, **kwargs))
+            atomic.extend(spans)
+            visible = processor.hide(visible, spans)
+        atomic.sort()
+
+        breaks = []
+        spans = iter(atomic)
+        start = end = -1
+        for match in self.re_paragraph.finditer(text):
+            # Skips atomic spans which end before the break
+            while end <= match.start():
+                start, end = next(spans, (len(text), len(text)))
+            if start >= match.end():
+                breaks.append(match.span())
+        return breaks
+
+    @staticmethod
+    def prepare(kwargs: dict) -> dict:
+        """
+        Prepares call arguments to be reused by many calls.
+        """
+
+        # Iterables are consumed by the first call, so they are materialized
+        # once for the whole batch, compiled sets are reused as is
+        escape_phrases = kwargs.get('escape_phrases')
+        if escape_phrases is None:
+            return kwargs
+
+        from .phrases import PhraseSet
+        if not isinstance(escape_phrases, PhraseSet):
+            kwargs = dict(kwargs, escape_phrases=tuple(escape_phrases))
+        return kwargs
 
+    def _finalize(self, processed: str, debug: bool) -> str:
         # Makes nbsp visible
         if debug:
             return self.re_nbsp.sub('_', processed)
@@ -0,0 +1,130 @@
+from bisect import bisect_right
+from typing import List, Tuple
+
+from .offsets import OffsetMap
+
+__all__ = ('Editor', )
+
+
+class Editor:
+    r"""
+    Keeps the output of a document being edited up to date. The source is
+    split at safe paragraph breaks (see :meth:`typus.core.TypusCore.breaks`)
+    and only paragraphs changed by an edit are processed again, the output
+    is the same as processing the whole source gives. The breaks
+    are found in the whole source every time, it's much cheaper than
+    processing it. Positions are mapped between the source and
+    the output, so the caret and selections stay in place,
+    see :class:`typus.offsets.OffsetMap`.
+
+    :param typus: :class:`typus.core.TypusCore` instance
+    :param str source: Initial text
+    :param kwargs: Optional settings passed to typus
+
+    >>> from typus import en_typus
+    >>> from typus.editor import Editor
+    >>> editor = Editor(en_typus, '"foo"\n\nbar (c)')
+    >>> editor.output
+    '“foo”\n\nbar ©'
+    >>> editor.update(11, 14, '(r) baz')  # replaces `(c)`
+    '“foo”\n\nbar® baz'
+    >>> editor.to_output(15), editor.to_source(12)  # `baz`
+    (12, 15)
+    """
+
+    def __init__(self, typus, source: str = '', *, debug=False, **kwargs):
+        self.typus = typus
+        self.kwargs = typus.prepare(kwargs)
+        self.debug = debug
+        self.source = ''
+        self.output = ''
+
+        # Source and output starts of paragraphs, their spans and offsets
+        self._starts = []
+        self._positions = []
+        self._paragraphs = []
+        self._processed = {}
+        self._build(source)
+
+    def update(self, start: int, end: int, text: str) -> str:
+        """
+        Replaces the source from ``start`` to ``end`` with the text
+        and returns the new output.
+        """
+
+        if not 0 <= start <= end <= len(self.source):
+            raise ValueError('Edit {0}:{1} is out of the source.'.format(
+                start, end))
+        self._build(self.source[:start] + text + self.source[end:])
+        return self.output
+
+    def to_output(self, position: int) -> int:
+        """
+        Returns position in the output of the source position.
+        """
+
+        index = bisect_right(self._starts, position) - 1
+        if index < 0:
+            return 0
+        start, end, _, offsets = self._paragraphs[index]
+        # Trailing spaces of the source go to the end of the last paragraph
+        return self._positions[index] + offsets.to_output(
+            min(position, end) - start)
+
+    def to_source(self, position: int) -> int:
+        """
+        Returns position in the source of the output position.
+        """
+
+        index = bisect_right(self._positions, position) - 1
+        if index < 0:
+            return 0
+        start, _, length, offsets = self._paragraphs[index]
+        return start + offsets.to_source(
+            min(position - self._positions[index], length))
+
+    def _build(self, source: str):
+        processed = {}
+        outputs = []
+        self._starts = []
+        self._positions = []
+        self._paragraphs = []
+        position = 0
+        for start, end in self._split(source):
+            text = source[start:end]
+            try:
+                output, offsets = self._processed[text]
+            except KeyError:
+                output, offsets = self._process(text)
+            processed[text] = output, offsets
+            self._starts.append(start)
+            self._positions.append(position)
+            self._paragraphs.append((start, end, len(output), offsets))
+            outputs.append(output)
+            position += len(output)
+
+        # Paragraphs which are gone aren't kept
+        self._processed = processed
+        self.source = source
+        self.output = ''.join(outputs)
+
+    def _split(self, source: str) -> List[Tuple[int, int]]:
+        # Spaces around the source are stripped like typus does,
+        # paragraphs keep breaks after them
+        first = len(source) - len(source.lstrip())
+        last = len(source.rstrip())
+        spans = []
+        start = first
+        for _, end in self.typus.breaks(source, **self.kwargs):
+            if first < end < last:
+                spans.append((start, end))
+                start = end
+        if start < last:
+            spans.append((start, last))
+        return spans
+
+    def _process(self, text: str) -> Tuple[str, OffsetMap]:
+        offsets = OffsetMap()
+        output = self.typus.process_part(
+            text, debug=self.debug, offsets=offsets, **self.kwargs)
+        return output, offsets
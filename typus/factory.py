@@ -0,0 +1,100 @@
+from typing import Type
+
+from . import EnTypus, RuTypus
+from .core import TypusCore
+from .processors import (
+    BaseExpressions,
+    BaseProcessor,
+    BaseQuotes,
+    EscapeHtml,
+    EscapePhrases,
+)
+from .registry import registry
+
+__all__ = ('from_config', )
+
+BASES = {'en': EnTypus, 'ru': RuTypus}
+
+# Config sections and processors they configure
+SECTIONS = (
+    ('escape_phrases', EscapePhrases),
+    ('escape_html', EscapeHtml),
+    ('quotes', BaseQuotes),
+    ('expressions', BaseExpressions),
+)
+
+
+def from_config(config: dict) -> TypusCore:
+    """
+    Builds typus from the config. ``lang`` picks the base typus,
+    the other keys are sections of processor class attributes to override,
+    a section set to ``False`` removes the processor.
+    Equal configs return the same typus, equal sections share processors
+    and compiled patterns, see :mod:`typus.registry`.
+
+    :param config: ``lang`` and sections: ``escape_phrases``,
+        ``escape_html``, ``quotes``, ``expressions``
+    :raises ValueError: If the config has unknown keys
+
+    >>> from typus.factory import from_config
+    >>> config = {'lang': 'ru', 'quotes': {'engine': 'stack'}}
+    >>> typus = from_config(config)
+    >>> typus('"foo" (c)')
+    '«foo» ©'
+    >>> from_config(config) is typus
+    True
+    """
+
+    return registry.get(
+        registry.key('typus', config), lambda: _build(config))
+
+
+def _build(original: dict) -> TypusCore:
+    config = dict(original)
+    lang = config.pop('lang', 'en')
+    try:
+        base = BASES[lang]
+    except KeyError:
+        raise ValueError('Unknown lang "{0}".'.format(lang))
+
+    sections = {
+        section: config.pop(section)
+        for section, _ in SECTIONS if section in config
+    }
+    if config:
+        raise ValueError('Unknown config keys: {0}.'.format(
+            ', '.join(map(str, config))))
+
+    processors = []
+    for processor in base.processors:
+        for section, parent in SECTIONS:
+            attrs = sections.get(section)
+            if attrs is False and issubclass(processor, parent):
+                break
+            if attrs and issubclass(processor, parent):
+                processor = _processor(processor, attrs)
+        else:
+            processors.append(processor)
+
+    def __reduce__(_self):
+        # The class is built on the fly, it can't be found by name
+        return from_config, (original, )
+
+    typus = type(base.__name__, (base, ), {
+        'processors': tuple(processors),
+        '__reduce__': __reduce__,
+    })
+    return typus()
+
+
+def _processor(processor: Type[BaseProcessor],
+               attrs: dict) -> Type[BaseProcessor]:
+    for name in attrs:
+        if not hasattr(processor, name):
+            raise ValueError('Unknown {0} option "{1}".'.format(
+                processor.__name__, name))
+
+    # Same subclass for equal options, so its rules are compiled once
+    return registry.get(
+        registry.key('processor', processor, attrs),
+        lambda: type(processor.__name__, (processor, ), dict(attrs)))
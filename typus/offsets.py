@@ -0,0 +1,164 @@
+from bisect import bisect_right
+from fractions import Fraction
+from functools import partial
+from typing import Callable, Iterable, List, Tuple
+
+__all__ = ('OffsetMap', )
+
+# Start, end and length of the replacement
+Edit = Tuple[int, int, int]
+
+
+class OffsetMap:
+    r"""
+    Maps positions between the source and the output of typus.
+    Processors which change the length of the text report their changes,
+    pass the map as ``offsets`` argument of the processors chain.
+    Processors which don't report anything must keep the length.
+
+    Every change is a replacement of a span with a text of another length.
+    Positions inside of a replaced span are scaled, so a position
+    inside of an escaped phrase gets back to the same place.
+
+    >>> from typus import en_typus
+    >>> from typus.offsets import OffsetMap
+    >>> offsets = OffsetMap()
+    >>> en_typus.procs.run('(c) foo...', offsets=offsets)
+    '©\xa0foo…'
+    >>> offsets.to_output(4), offsets.to_source(2)
+    (2, 4)
+    """
+
+    def __init__(self):
+        self._steps = []
+
+    def __bool__(self):
+        return bool(self._steps)
+
+    def record(self, edits: Iterable[Edit]):
+        """
+        Records a step of changes: sorted spans of the text given to
+        the step and lengths of their replacements.
+        """
+
+        starts, ends, lengths, shifts = [], [], [], []
+        shift = 0
+        for start, end, length in edits:
+            starts.append(start)
+            ends.append(end)
+            lengths.append(length)
+            shifts.append(shift)
+            shift += length - (end - start)
+        if starts:
+            self._steps.append((starts, ends, lengths, shifts))
+
+    def sub(self, expression: Callable[[str], str], text: str) -> str:
+        """
+        Runs the expression, a partial of ``pattern.sub``, and records
+        its changes. Other functions are recorded as a single change.
+        """
+
+        func = getattr(expression, 'func', None)
+        if not (isinstance(expression, partial)
+                and getattr(func, '__name__', None) == 'sub'):
+            processed = expression(text)
+            if processed is not text:
+                self.record(_diff(text, processed, 0))
+            return processed
+
+        replace, = expression.args
+        edits = []
+
+        def recorder(match):
+            if callable(replace):
+                result = replace(match)
+            else:
+                result = match.expand(replace)
+            edits.extend(_diff(match.group(), result, match.start()))
+            return result
+
+        processed = func(recorder, text)
+        self.record(edits)
+        return processed
+
+    def replace(self, text: str, old: str, new: str) -> str:
+        """
+        Same as ``text.replace(old, new)``, records the changes.
+        """
+
+        edits = []
+        start = text.find(old)
+        while start != -1:
+            edits.append((start, start + len(old), len(new)))
+            start = text.find(old, start + len(old))
+        self.record(edits)
+        return text.replace(old, new)
+
+    def to_output(self, position: int) -> int:
+        """
+        Returns position in the output of the source position.
+        """
+
+        value = position
+        for starts, ends, lengths, shifts in self._steps:
+            index = bisect_right(starts, value) - 1
+            if index < 0:
+                continue
+            start, end = starts[index], ends[index]
+            length, shift = lengths[index], shifts[index]
+            if value < end:
+                value = start + shift + Fraction(
+                    (value - start) * length, end - start)
+            else:
+                value += shift + length - (end - start)
+        return int(value)
+
+    def to_source(self, position: int) -> int:
+        """
+        Returns position in the source of the output position.
+        """
+
+        value = position
+        for starts, ends, lengths, shifts in reversed(self._steps):
+            # Spans of the output of the step
+            index = bisect_right(
+                _Shifted(starts, shifts), value) - 1
+            if index < 0:
+                continue
+            start, end = starts[index], ends[index]
+            length, shift = lengths[index], shifts[index]
+            if value < start + shift + length:
+                value = start + Fraction(
+                    (value - start - shift) * (end - start), length)
+            else:
+                value -= shift + length - (end - start)
+        return int(value)
+
+
+class _Shifted:
+    # Starts of spans in the output of the step, made on demand for bisect
+    __slots__ = ('starts', 'shifts')
+
+    def __init__(self, starts: List[int], shifts: List[int]):
+        self.starts = starts
+        self.shifts = shifts
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> int:
+        return self.starts[index] + self.shifts[index]
+
+
+def _diff(old: str, new: str, offset: int) -> List[Edit]:
+    # The changed span only, replacements often keep groups as is
+    if old == new:
+        return []
+    size = min(len(old), len(new))
+    head = 0
+    while head < size and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < size - head and old[-tail - 1] == new[-tail - 1]:
+        tail += 1
+    return [(offset + head, offset + len(old) - tail, len(new) - head - tail)]
@@ -0,0 +1,123 @@
+import re
+from functools import lru_cache
+from typing import Iterable, Iterator, Match
+
+from .utils import RE_SCASE, re_compile
+
+__all__ = ('PhraseSet', 'compile_phrases')
+
+
+class PhraseSet:
+    """
+    Compiled set of phrases for
+    :class:`typus.processors.EscapePhrases`. Phrases are put into a trie
+    which is compiled into a single regex, so the text is scanned once
+    no matter how many phrases there are. Overlapping phrases are
+    matched leftmost first, the longest one wins if they start at the same
+    position. Blank phrases are ignored.
+
+    Use :func:`compile_phrases` to get one.
+
+    >>> phrases = compile_phrases(['foo', 'foobar', 'bar baz'])
+    >>> [match.group() for match in phrases.finditer('foobar baz')]
+    ['foobar']
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = _normalize(phrases)
+        self.pattern = re_compile(
+            self._build(self._trie(self.phrases)) if self.phrases else '(?!)',
+            flags=RE_SCASE)
+        self._hash = hash(self.phrases)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.phrases)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def __eq__(self, other):
+        if not isinstance(other, PhraseSet):
+            return NotImplemented
+        return self.phrases == other.phrases
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return compile_phrases, (self.phrases, )
+
+    def __repr__(self):
+        return '<{0}: {1} phrases>'.format(
+            self.__class__.__name__, len(self.phrases))
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        return self.pattern.finditer(text)
+
+    @staticmethod
+    def _trie(phrases: Iterable[str]) -> dict:
+        # The empty key marks the end of a phrase
+        root = {}
+        for phrase in phrases:
+            node = root
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return root
+
+    @classmethod
+    def _build(cls, node: dict) -> str:
+        """
+        Turns the trie into a pattern. Chains of single children are
+        merged into literals to keep nesting shallow. Optional tails are
+        greedy, so longer phrases are tried first.
+        """
+
+        branches = []
+        for char, child in node.items():
+            if not char:
+                continue
+            literal = [char]
+            while len(child) == 1 and '' not in child:
+                (char, child), = child.items()
+                literal.append(char)
+            branches.append(re.escape(''.join(literal)) + cls._build(child))
+
+        if not branches:
+            return ''
+        pattern = '|'.join(branches)
+        if '' in node:
+            return '(?:{0})?'.format(pattern)
+        if len(branches) > 1:
+            return '(?:{0})'.format(pattern)
+        return pattern
+
+
+def _normalize(phrases: Iterable[str]) -> tuple:
+    # Unique and non-blank, order is kept
+    return tuple(dict.fromkeys(
+        phrase for phrase in phrases if phrase.strip()))
+
+
+@lru_cache(maxsize=32)
+def _compile(phrases: tuple) -> PhraseSet:
+    return PhraseSet(phrases)
+
+
+def compile_phrases(phrases: Iterable[str]) -> PhraseSet:
+    """
+    Returns a compiled :class:`PhraseSet` to pass as ``escape_phrases``
+    instead of a list. Recently compiled sets are cached, so the same
+    phrases are compiled once.
+
+    >>> from typus import en_typus
+    >>> phrases = compile_phrases(['`(c)`', '`(r)`'])
+    >>> en_typus('Typus turns `(c)` into "(c)"', escape_phrases=phrases)
+    'Typus turns `(c)` into “©”'
+    >>> compile_phrases(['`(c)`', '`(r)`']) is phrases
+    True
+    """
+
+    if isinstance(phrases, PhraseSet):
+        return phrases
+    return _compile(_normalize(phrases))
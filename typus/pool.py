@@ -0,0 +1,170 @@
+import concurrent.futures
+from functools import partial
+from typing import Callable, Iterable, Iterator, List
+
+from .core import TypusCore
+
+__all__ = ('TypusPool', )
+
+# Set in every worker of process and interpreter pools
+worker_typus = None
+
+
+def init_worker(typus: TypusCore):
+    global worker_typus  # pylint: disable=global-statement
+    worker_typus = typus
+
+
+def run_worker(texts: List[str], kwargs: dict) -> List[str]:
+    return worker_typus.map(texts, **kwargs)
+
+
+def run_parts(typus: TypusCore, parts: List[str], kwargs: dict) -> List[str]:
+    return [typus.process_part(part, **kwargs) for part in parts]
+
+
+def run_parts_worker(parts: List[str], kwargs: dict) -> List[str]:
+    return run_parts(worker_typus, parts, kwargs)
+
+
+class TypusPool:
+    """
+    Spreads batches over a pool of workers. Inputs are deduplicated,
+    grouped into chunks of about ``chunk_size`` characters and the largest
+    chunks are scheduled first, so one huge document doesn't stall
+    the whole batch.
+
+    :param typus: :class:`typus.core.TypusCore` instance to run
+    :param str executor: ``thread``, ``process`` or ``interpreter``.
+        The latter is available on Python 3.14 and higher only.
+    :param int workers: Number of workers, defaults to executor's choice
+    :param int chunk_size: Total length of texts sent to worker at once,
+        also the size of parts :meth:`process` splits a text into
+
+    >>> from typus import en_typus
+    >>> from typus.pool import TypusPool
+    >>> with TypusPool(en_typus, workers=2) as pool:
+    ...     pool.map(['"foo"', '(c)', '"foo"'])
+    ['“foo”', '©', '“foo”']
+
+    .. note::
+        Process and interpreter workers build their own Typus instance
+        from the class, so it must be importable. Thread workers share
+        the GIL, they pay off for small batches only.
+    """
+
+    executors = {
+        'thread': concurrent.futures.ThreadPoolExecutor,
+        'process': concurrent.futures.ProcessPoolExecutor,
+        'interpreter': getattr(
+            concurrent.futures, 'InterpreterPoolExecutor', None),
+    }
+
+    def __init__(self, typus: TypusCore, executor: str = 'thread',
+                 workers: int = None, chunk_size: int = 2 ** 16):
+        executor_class = self.executors.get(executor)
+        if executor_class is None:
+            raise ValueError(
+                'Executor "{0}" is not supported.'.format(executor))
+
+        self.typus = typus
+        self.chunk_size = chunk_size
+        if executor == 'thread':
+            self.executor = executor_class(workers)
+            self.run = self._run_thread
+            self.run_parts = partial(run_parts, typus)
+        else:
+            self.executor = executor_class(
+                workers, initializer=init_worker, initargs=(typus, ))
+            self.run = run_worker
+            self.run_parts = run_parts_worker
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+
+    def map(self, texts: Iterable[str], **kwargs) -> List[str]:
+        """
+        Works as :meth:`typus.core.TypusCore.map` but in parallel.
+        """
+
+        texts = [text.strip() for text in texts]
+        done = self._submit(self.run, texts, self.typus.prepare(kwargs))
+        return [done[text] for text in texts]
+
+    def process(self, text: str, *, debug=False, **kwargs) -> str:
+        r"""
+        Works as :meth:`typus.core.TypusCore.__call__`, but splits a large
+        text at safe paragraph breaks (see :meth:`typus.core.TypusCore.breaks`)
+        into parts of about ``chunk_size`` characters and processes them
+        in parallel. The result is the same.
+
+        >>> from typus import en_typus
+        >>> from typus.pool import TypusPool
+        >>> with TypusPool(en_typus, chunk_size=4) as pool:
+        ...     pool.process('"foo"\n\n\n(c) bar')
+        '“foo”\n\n©\xa0bar'
+        """
+
+        text = text.strip()
+        kwargs = self.typus.prepare(kwargs)
+        if len(text) <= self.chunk_size:
+            return self.typus(text, debug=debug, **kwargs)
+
+        parts = self._parts(text, kwargs)
+        done = self._submit(self.run_parts, parts, dict(kwargs, debug=debug))
+        return ''.join(done[part] for part in parts)
+
+    def _parts(self, text: str, kwargs: dict) -> List[str]:
+        """
+        Splits the text right after safe paragraph breaks into parts
+        of ``chunk_size`` characters at least.
+        """
+
+        parts = []
+        start = 0
+        for _, end in self.typus.breaks(text, **kwargs):
+            if end - start >= self.chunk_size:
+                parts.append(text[start:end])
+                start = end
+        parts.append(text[start:])
+        return parts
+
+    def _submit(self, run: Callable, texts: List[str], kwargs: dict) -> dict:
+        """
+        Runs distinct texts in chunks, the largest first, and returns
+        results by text.
+        """
+
+        unique = sorted(set(texts), key=len, reverse=True)
+        futures = [
+            (chunk, self.executor.submit(run, chunk, kwargs))
+            for chunk in self._chunks(unique)
+        ]
+        done = {}
+        for chunk, future in futures:
+            done.update(zip(chunk, future.result()))
+        return done
+
+    def _run_thread(self, texts: List[str], kwargs: dict) -> List[str]:
+        return self.typus.map(texts, **kwargs)
+
+    def _chunks(self, texts: List[str]) -> Iterator[List[str]]:
+        """
+        Groups texts sorted by length into chunks. Big texts go alone.
+        """
+
+        chunk, size = [], 0
+        for text in texts:
+            if chunk and size + len(text) > self.chunk_size:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text)
+        if chunk:
+            yield chunk
@@ -0,0 +1,55 @@
+import gc
+from typing import Iterable
+
+from .core import TypusCore
+
+__all__ = ('CORPUS', 'warmup')
+
+# Touches every processor and most of the expressions
+CORPUS = (
+    '"I don\'t feel very much like Pooh today..." said Pooh.',
+    '"There there," said Piglet. "I\'ll bring you tea and honey."',
+    'Он сказал: "\'Винни-Пух\' -- моя любимая книга!".',
+    'Size 10-15 mm, 1/2 price - only 1000 р. (c) (r) (tm) 2018 +- 3 * 4',
+    '<p class="x">He said "<b>hi</b>" <!-- x --> <code>a--b</code></p>',
+    '1\'2" <img alt="a" src="b.png"/> 5 x 6 т. е. 10 %, 12:30 -- 13:30',
+)
+
+
+def warmup(instances: Iterable[TypusCore] = None,
+           corpus: Iterable[str] = CORPUS, freeze: bool = True):
+    """
+    Prepares typus in the master process of a pre-fork server, like
+    gunicorn or uwsgi, so workers share the result copy-on-write.
+    Builds processors of every instance, runs the corpus to fill
+    :mod:`re` caches and, if ``freeze`` is set, moves everything allocated
+    so far out of garbage collector's reach with :func:`gc.freeze`.
+    Otherwise the first collection in every worker touches those objects
+    and copies their memory pages.
+
+    :param instances: Typus instances, ``en_typus`` and ``ru_typus``
+        by default
+    :param corpus: Texts to process
+    :param freeze: Freezes the garbage collector
+
+    >>> from typus import en_typus, warmup
+    >>> warmup([en_typus], freeze=False)
+    >>> 'procs' in vars(en_typus)
+    True
+    """
+
+    if instances is None:
+        from . import en_typus, ru_typus
+        instances = en_typus, ru_typus
+
+    corpus = tuple(corpus)
+    for typus in instances:
+        # Skips the result cache, it shouldn't be full of samples
+        run = typus.procs.run
+        for text in corpus:
+            run(text, escape_phrases=('(c)', ))
+
+    if freeze and hasattr(gc, 'freeze'):
+        # Collects the garbage first to not freeze it forever
+        gc.collect()
+        gc.freeze()
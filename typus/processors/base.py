@@ -1,5 +1,6 @@
+# pylint: disable=unused-argument
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import Iterable, Iterator, List, Optional, Tuple, Type
 
 from typus.core import TypusCore
 
@@ -11,6 +12,10 @@ class BaseProcessor(ABC):
 
     other: 'BaseProcessor' = None
 
+    # Joins texts of a batch, see :meth:`run_batch`. A noncharacter,
+    # so it's neither a word, digit or space nor a part of a real text
+    separator = '\uffff'
+
     def __init__(self, typus: TypusCore):
         # Stores Typus to access it's configuration
         self.typus = typus
@@ -19,6 +24,16 @@ class BaseProcessor(ABC):
         self.other = other
         return self
 
+    def __iter__(self) -> Iterator['BaseProcessor']:
+        """
+        Iterates over the chain starting from the current processor.
+        """
+
+        processor = self
+        while processor:
+            yield processor
+            processor = processor.other
+
     @abstractmethod
     def run(self, text: str, **kwargs) -> str:
         """
@@ -27,7 +42,67 @@ class BaseProcessor(ABC):
         :return: Output text
         """
 
+    def atomic(self, text: str, *, complete: bool = True,
+               **kwargs) -> Iterable[Tuple[int, int]]:
+        """
+        Returns spans of the text which must not be split into parts,
+        because the processor handles them as a whole.
+
+        :param text: Input text
+        :param complete: ``False`` if the text is a beginning of a bigger
+            one, unclosed spans should last till the end then
+        :param kwargs: Optional settings for the current call
+        :return: Pairs of start and end indexes
+        """
+
+        return ()
+
+    def hide(self, text: str, spans: List[Tuple[int, int]]) -> str:
+        """
+        Returns the text the rest of the chain gets, as far as it can be
+        told without processing it. Indexes must stay the same.
+
+        :param text: Input text
+        :param spans: Spans returned by :meth:`atomic`
+        :return: Text of the same length
+        """
+
+        return text
+
+    def run_batch(self, texts: List[str], **kwargs) -> List[str]:
+        """
+        Processes many texts at once, results are the same :meth:`run`
+        gives. Processors which can run a pass over all texts joined with
+        :attr:`separator` do so, others run texts one by one.
+
+        :param texts: Input texts
+        :param kwargs: Optional settings for the current call
+        :return: Output texts
+        """
+
+        return [self.run(text, **kwargs) for text in texts]
+
     def run_other(self, text: str, **kwargs) -> str:
         if self.other:
+            # Records the call, see :meth:`typus.core.TypusCore.trace`
+            tracer = kwargs.get('tracer')
+            if tracer is not None:
+                return tracer.run(self.other, text, **kwargs)
             return self.other.run(text, **kwargs)
         return text
+
+    def run_other_batch(self, texts: List[str], **kwargs) -> List[str]:
+        if self.other:
+            return self.other.run_batch(texts, **kwargs)
+        return texts
+
+    def _joined(self, texts: List[str]) -> Optional[str]:
+        """
+        Returns texts joined with :attr:`separator` or ``None``
+        if any of them has it.
+        """
+
+        buffer = self.separator.join(texts)
+        if buffer.count(self.separator) >= len(texts):
+            return None
+        return buffer
@@ -1,38 +1,125 @@
+import re
 from abc import abstractmethod
+from functools import partial
 from itertools import count
+from typing import TYPE_CHECKING, List, Tuple
 
-from ..utils import re_compile
+from ..chars import MARKERS
+from ..utils import re_choices, re_compile
 from .base import BaseProcessor
 
+if TYPE_CHECKING:  # pragma: nocover
+    from ..phrases import PhraseSet
+
 
 class BaseEscapeProcessor(BaseProcessor):
+    r"""
+    Replaces parts of the text with keys and puts them back after
+    the rest of typus is done. A key is the :attr:`marker` with the index
+    of the value written in private use area digits, like
+    ``\ue000\ue100\ue000``, so rules never match it. Keys are put back
+    in a single pass, no matter how many of them there are.
+    """
+
+    # Private use area characters, markers are below digits
+    # and must be one of :const:`typus.chars.MARKERS`
+    marker = '\ue000'
+    digits = ''.join(map(chr, range(0xE100, 0xE200)))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not re.fullmatch(MARKERS, self.marker):
+            raise ValueError('Unknown marker "{0}".'.format(self.marker))
+        self.re_key = re_compile('{0}[{1}-{2}]+{0}'.format(
+            self.marker, self.digits[0], self.digits[-1]))
+
     def run(self, text: str, **kwargs) -> str:
         storage = []
-        counter = count()
-        escaped = self._save_values(text, storage, counter, **kwargs)
+        escaped = self._escape(text, storage, **kwargs)
 
         # Runs typus
         processed = self.run_other(escaped, **kwargs)
         if not storage:
             return processed
 
-        restored = self._restore_values(processed, storage)
+        restored = self._restore_values(
+            processed, storage, kwargs.get('offsets'))
         return restored
 
+    def run_batch(self, texts, **kwargs):
+        storages = [[] for _ in texts]
+        escaped = [
+            self._escape(text, storage, **kwargs)
+            for text, storage in zip(texts, storages)
+        ]
+        processed = self.run_other_batch(escaped, **kwargs)
+        return [
+            self._restore_values(text, storage) if storage else text
+            for text, storage in zip(processed, storages)
+        ]
+
+    def _escape(self, text: str, storage: list, **kwargs) -> str:
+        counter = count()
+        offsets = kwargs.get('offsets')
+
+        # Markers already in the text are escaped too,
+        # so nothing but keys is restored
+        if self.marker in text:
+            key = self._key(next(counter))
+            storage.append((key, self.marker))
+            if offsets is None:
+                text = text.replace(self.marker, key)
+            else:
+                text = offsets.replace(text, self.marker, key)
+
+        return self._save_values(text, storage, counter, **kwargs)
+
+    def hide(self, text, spans):
+        # Markers stand for keys, rules never match them either
+        hidden = []
+        last = 0
+        for start, end in sorted(spans):
+            start = max(start, last)
+            if start < end:
+                hidden.append(text[last:start])
+                hidden.append(self.marker * (end - start))
+                last = end
+        hidden.append(text[last:])
+        return ''.join(hidden)
+
     @abstractmethod
     def _save_values(self, *args, **kwargs):
         pass  # pragma: nocover
 
-    @staticmethod
-    def _restore_values(text, storage):
+    def _key(self, index: int) -> str:
+        base = len(self.digits)
+        key = [self.marker]
+        while True:
+            index, digit = divmod(index, base)
+            key.append(self.digits[digit])
+            if not index:
+                break
+        key.append(self.marker)
+        return ''.join(key)
+
+    def _restore_values(self, text, storage, offsets=None):
         """
-        Puts data into the text in reversed order.
-        It's important to loop over and restore text step by step
-        because some 'stored' chunks may contain keys to other ones.
+        Puts data into the text in one pass.
+        Stored chunks may contain keys to other ones, those are
+        restored as well.
         """
-        for key, value in reversed(storage):
-            text = text.replace(key, value)
-        return text
+
+        values = dict(storage)
+
+        def replace(match):
+            value = values[match.group()]
+            if self.marker in value:
+                return self.re_key.sub(replace, value)
+            return value
+
+        if offsets is not None:
+            return offsets.sub(partial(self.re_key.sub, replace), text)
+        return self.re_key.sub(replace, text)
 
 
 class EscapePhrases(BaseEscapeProcessor):
@@ -44,53 +131,226 @@ class EscapePhrases(BaseEscapeProcessor):
     'Typus turns `(c)` into “©”'
 
     Also there is a little helper :func:`typus.utils.splinter` which should
-    help you to split string into the phrases.
+    help you to split string into the phrases. Pass
+    :func:`typus.phrases.compile_phrases` result instead of the list
+    to find all phrases in a single scan.
     """
 
-    placeholder = '{{#phrase{0}#}}'
+    def _save_values(self, text, storage, counter, escape_phrases=(),
+                     offsets=None, **kwargs):
+        if not escape_phrases:
+            return text
+
+        # Compiled sets are imported only by those who use them
+        from ..phrases import PhraseSet
+        if isinstance(escape_phrases, PhraseSet):
+            return self._save_phrase_set(
+                text, storage, counter, escape_phrases, offsets)
 
-    def _save_values(
-            self, text, storage, counter, escape_phrases=(), **kwargs):
         for phrase in escape_phrases:
             if not phrase.strip():
                 continue
-            key = self.placeholder.format(next(counter))
-            text = text.replace(phrase, key)
+            key = self._key(next(counter))
+            if offsets is None:
+                text = text.replace(phrase, key)
+            else:
+                text = offsets.replace(text, phrase, key)
             storage.append((key, phrase))
         return text
 
+    def _save_phrase_set(self, text, storage, counter, phrases: 'PhraseSet',
+                         offsets=None):
+        keys = {}
+
+        def replace(match):
+            phrase = match.group()
+            try:
+                return keys[phrase]
+            except KeyError:
+                key = keys[phrase] = self._key(next(counter))
+                storage.append((key, phrase))
+                return key
+
+        if offsets is not None:
+            return offsets.sub(partial(phrases.pattern.sub, replace), text)
+        return phrases.pattern.sub(replace, text)
+
+    def atomic(self, text, *, escape_phrases=(), **kwargs):
+        if not escape_phrases:
+            return
+
+        from ..phrases import PhraseSet
+        if isinstance(escape_phrases, PhraseSet):
+            for match in escape_phrases.finditer(text):
+                yield match.span()
+            return
+
+        for phrase in escape_phrases:
+            if not phrase.strip():
+                continue
+            start = text.find(phrase)
+            while start != -1:
+                end = start + len(phrase)
+                yield start, end
+                start = text.find(phrase, end)
+
 
 class EscapeHtml(BaseEscapeProcessor):
-    """
-    Extracts html tags and puts them back after.
+    r"""
+    Extracts html tags and puts them back after. Contents of
+    :attr:`skiptags`, like ``<code>``, are never processed, nested ones
+    included. The markup is found in a single pass over the text.
 
     >>> from typus import en_typus
     >>> en_typus('Typus turns <code>(c)</code> into "(c)"')
     'Typus turns <code>(c)</code> into “©”'
 
-    .. caution::
-        Doesn't support nested ``<code>`` tags.
+    Values of ``attributes`` are processed as a separate text:
+
+    >>> from typus import EnTypus
+    >>> from typus.processors import EnQuotes, EnRuExpressions
+    >>> class MyEscapeHtml(EscapeHtml):
+    ...     attributes = ('title', 'alt')
+    ...
+    >>> class MyTypus(EnTypus):
+    ...     processors = (EscapePhrases, MyEscapeHtml, EnQuotes,
+    ...                   EnRuExpressions)
+    ...
+    >>> MyTypus()('<img alt="(c) 2018" src="a--b.png">')
+    '<img alt="©\xa02018" src="a--b.png">'
     """
 
-    placeholder = '{{#html{0}#}}'
+    marker = '\ue001'
     skiptags = 'head|iframe|pre|code|script|style|video|audio|canvas'
-    patterns = (
-        re_compile(r'(<)({0})(.*?>.*?</\2>)'.format(skiptags)),
-        # Doctype, xml, closing tag, any tag
-        re_compile(r'(<[\!\?/]?[a-z]+.*?>)'),
-        # Comments
-        re_compile(r'(<\!\-\-.*?\-\->)'),
-    )
-
-    def _save_values(self, text, storage, counter, **kwargs):
-        for pattern in self.patterns:
-            text = pattern.sub(self._replace(storage, counter), text)
-        return text
+    attributes = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.re_token = re_compile(
+            # Comments
+            r'<\!\-\-.*?\-\->'
+            # Skip tags, opening and closing
+            r'|<(/?)({0})\b([^>]*)>'
+            # Doctype, xml, closing tag, any tag
+            r'|<[\!\?/]?[a-z]+[^>]*>'.format(self.skiptags)
+        )
+        self.re_attributes = re_compile(
+            r'(\s{0}\s*=\s*)(["\'])(.*?)\2'.format(
+                re_choices(self.attributes, r'(?:{0})'))
+        ) if self.attributes else None
 
-    def _replace(self, storage, counter):
-        def inner(match):
-            key = self.placeholder.format(next(counter))
-            html = ''.join(match.groups())
+    def _save_values(self, text, storage, counter, offsets=None, **kwargs):
+        # Every token starts with a bracket
+        if '<' not in text:
+            return text
+
+        chunks = []
+        edits = []
+        last = 0
+        for start, end in self._segments(text)[0]:
+            html = text[start:end]
+            if self.re_attributes is not None:
+                html = self._process_attributes(html, kwargs)
+            key = self._key(next(counter))
             storage.append((key, html))
-            return key
-        return inner
+            chunks.extend((text[last:start], key))
+            edits.append((start, end, len(key)))
+            last = end
+        chunks.append(text[last:])
+        if offsets is not None:
+            offsets.record(edits)
+        return ''.join(chunks)
+
+    def atomic(self, text, *, complete=True, **kwargs):
+        spans, unclosed = self._segments(text)
+        if complete:
+            return spans
+
+        # Blocks which may be closed in the rest of the text
+        return spans + [(start, len(text)) for start in unclosed]
+
+    def _segments(self, text: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """
+        Returns spans of the markup and starts of unclosed skip tags.
+        Skip tags with their contents are a single span.
+        """
+
+        # Tokens which never close would be searched for till the end
+        # of the text from every bracket. Tags can't close after the last
+        # bracket, so the search stops there, and comments opened after
+        # the last `-->` are hidden, the length stays the same
+        end = text.rfind('>') + 1
+        closed = max(text.rfind('-->') - 3, 0)
+        if '<!--' in text[closed:end]:
+            text = text[:closed] + text[closed:end].replace('<!--', '\0!--')
+        tokens = list(self.re_token.finditer(text, 0, end))
+
+        # Pairs skip tags up: index of the opening token to the closing one
+        closing = {}
+        stacks = {}
+        closers = {}
+        for index, token in enumerate(tokens):
+            name = token[2]
+            if name is None:
+                continue
+            name = name.lower()
+            stack = stacks.setdefault(name, [])
+            if token[1]:
+                closers.setdefault(name, []).append(index)
+                if stack:
+                    closing[stack.pop()] = index
+            elif not token[3].endswith('/'):
+                stack.append(index)
+
+        unclosed = sorted(
+            tokens[index].start() for stack in stacks.values()
+            for index in stack)
+
+        # Unclosed tags take the first closing one after them,
+        # so their contents are escaped like a lazy `<pre>.*?</pre>` does
+        for name, stack in stacks.items():
+            closing.update(self._pair_unclosed(stack, closers.get(name, ())))
+        if not closing:
+            return [token.span() for token in tokens], unclosed
+
+        spans = []
+        index = 0
+        while index < len(tokens):
+            start, end = tokens[index].span()
+            if index in closing:
+                index = closing[index]
+                end = tokens[index].end()
+            spans.append((start, end))
+            index += 1
+        return spans, unclosed
+
+    @staticmethod
+    def _pair_unclosed(openers: List[int], closers: List[int]):
+        """
+        Yields openers paired with the first closer after them.
+        """
+
+        later = iter(closers)
+        closer = next(later, None)
+        for index in openers:
+            while closer is not None and closer < index:
+                closer = next(later, None)
+            if closer is None:
+                return
+            yield index, closer
+
+    def _process_attributes(self, html: str, kwargs: dict) -> str:
+        """
+        Processes the rest of typus over values of :attr:`attributes`
+        of opening tags, skip tags are left as is.
+        """
+
+        if html[1] in '!?/' or self.re_token.match(html)[2]:
+            return html
+
+        def replace(match):
+            prefix, quote, value = match.groups()
+            value = self.run_other(value, **kwargs)
+            return ''.join((prefix, quote, value, quote))
+
+        return self.re_attributes.sub(replace, html)
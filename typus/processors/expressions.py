@@ -1,10 +1,15 @@
 import re
 from functools import partial
+from typing import TYPE_CHECKING
 
 from ..chars import *
+from ..registry import registry
 from ..utils import RE_SCASE, doc_map, map_choices, re_choices, re_compile
 from .base import BaseProcessor
 
+if TYPE_CHECKING:  # pragma: nocover
+    from ..analysis import RuleInfo
+
 
 class BaseExpressions(BaseProcessor):
     r"""
@@ -26,7 +31,7 @@ class BaseExpressions(BaseProcessor):
     >>> class MyTypus(TypusCore):
     ...     processors = (MyExpressions, )
     ...
-    >>> my_typus = MyTypus()  # `expr_bold_price` is compiled and stored
+    >>> my_typus = MyTypus()  # `expr_bold_price` is compiled on first call
     >>> my_typus('Get now just for $1000!')
     'Get now just for <b>$1000</b>!'
 
@@ -35,24 +40,119 @@ class BaseExpressions(BaseProcessor):
         compiled with :func:`typus.utils.re_compile` with a bunch of flags:
         unicode, case-insensitive, etc. If that doesn't suit for you pass your
         own flags as a third member of the tuple: ``(regex, replace, re.I)``.
+
+    Expressions are skipped if the text has none of the characters
+    they need, set ``gating = False`` to run them all anyway.
     """
 
     expressions = NotImplemented
+    gating = True
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
         # Compiles expressions
-        self.compiled = tuple(
-            partial(re_compile(*expr[::2]).sub, expr[1])
+        self.rules = tuple(
+            ('{0}[{1}]'.format(name, index),
+             re_compile(*expr[::2]), expr[1])
             for name in self.expressions
-            for expr in getattr(self, 'expr_' + name)()
+            for index, expr in enumerate(getattr(self, 'expr_' + name)())
+        )
+
+        # Equal rules of other instances are compiled already,
+        # the separator decides which passes run over joined texts
+        key = registry.key(
+            'expressions', self.separator,
+            [(pattern, replace) for _, pattern, replace in self.rules])
+        self.compiled, self.gate, self.puts, self.separates = (
+            registry.get(key, self._compile))
+        self.names = tuple(name for name, _, _ in self.rules)
+
+    def _compile(self) -> tuple:
+        # Analysis is needed on the first call only
+        from ..analysis import Gate, separates
+
+        rules = [self._analyse(*rule) for rule in self.rules]
+        compiled = tuple(
+            partial(rule.pattern.sub, rule.replace) for rule in rules)
+
+        # Skips passes which can't match the text, see :meth:`run`
+        gate = Gate(rule.triggers for rule in rules)
+        puts = tuple(
+            None if rule.puts is None else gate.mask(rule.puts)
+            for rule in rules
         )
 
+        # Passes which can run over texts of a batch joined together,
+        # see :meth:`run_batch`
+        separated = tuple(
+            separates(rule, self.separator) for rule in rules)
+        return compiled, gate, puts, separated
+
+    @staticmethod
+    def _analyse(name, pattern, replace) -> 'RuleInfo':
+        from ..analysis import analyse
+
+        # Analysis is the slowest part, it's shared between equal rules
+        info = registry.get(
+            registry.key('rule', pattern, replace),
+            lambda: analyse(name, pattern, replace))
+        return info if info.name == name else info._replace(name=name)
+
     def run(self, text: str, **kwargs) -> str:
-        for expression in self.compiled:
-            text = expression(text)
-        return self.run_other(text, **kwargs)
+        compiled = self.compiled
+        offsets = kwargs.get('offsets')
+        if offsets is not None:
+            # Reports changes, see :class:`typus.offsets.OffsetMap`
+            compiled = [partial(offsets.sub, x) for x in compiled]
+        tracer = kwargs.get('tracer')
+        if tracer is not None:
+            compiled = tracer.passes(self, compiled)
+        return self.run_other(self._apply(compiled, text), **kwargs)
+
+    def run_batch(self, texts, **kwargs):
+        buffer = self._joined(texts)
+        if buffer is None:
+            processed = [self._apply(self.compiled, text) for text in texts]
+            return self.run_other_batch(processed, **kwargs)
+
+        # Passes which look at the separator or check text boundaries
+        # run text by text
+        compiled = [
+            expression if safe else partial(self._each, expression)
+            for expression, safe in zip(self.compiled, self.separates)
+        ]
+        processed = self._apply(compiled, buffer)
+        return self.run_other_batch(
+            processed.split(self.separator), **kwargs)
+
+    def _each(self, expression, buffer: str) -> str:
+        texts = buffer.split(self.separator)
+        processed = [expression(text) for text in texts]
+        if all(map(str.__eq__, texts, processed)):
+            return buffer
+        return self.separator.join(processed)
+
+    def _apply(self, compiled, text: str) -> str:
+        if not self.gating:
+            for expression in compiled:
+                text = expression(text)
+            return text
+
+        # Runs only passes triggered by characters in the text
+        # and updates the mask with characters they put
+        gate = self.gate
+        mask = gate.mask(set(text))
+        for index, expression in enumerate(compiled):
+            if not mask >> index & 1:
+                continue
+            processed = expression(text)
+            if processed is text:
+                continue
+            text = processed
+            puts = self.puts[index]
+            mask |= gate.mask(set(text)) if puts is None else puts
+        return text
 
 
 class EnRuExpressions(BaseExpressions):
@@ -245,25 +345,58 @@ class EnRuExpressions(BaseExpressions):
         'foo\u202f—\u2009bar'
         """
 
+        # Escape keys stand for html and phrases, so their markers,
+        # private use area characters below key digits, are word
+        # boundaries too, though keys have no word characters
+        re_boundary = re_compile(r'\b|{0}'.format(MARKERS))
+        re_dash = re_compile(r'(?<={0})[\-|{1}]{0}+'.format(ANYSP, NDASH))
+
+        # A run of non-digits within a paragraph, spaces around line
+        # breaks are trimmed already, so paragraphs are split with `\n\n`
+        run = r'(?:[^\d\n]|\n(?!\n))'
+
+        def replace(match):
+            # Matches the whole run of non-digits at once and replaces
+            # its last dash if any word boundary goes before it
+            start, end = match.span()
+            text = match.string
+            boundary = re_boundary.search(text, start, end)
+            dash = None
+            if boundary is not None:
+                for dash in re_dash.finditer(text, boundary.start() + 2, end):
+                    pass
+            if dash is None:
+                return match.group()
+            return '{0}{1}{2}'.format(
+                text[start:dash.start() - 1], MDASH_PAIR, text[dash.end():end])
+
         expr = (
             # Double dash guarantees to be replaced with mdash
             (r'{0}--{0}'.format(WHSP), MDASH_PAIR),
 
             # Dash can be between anything except digits
             # because in that case it's not obvious
-            (r'{0}+[\-|{1}]{0}+(?!\d\b)'.format(ANYSP, NDASH), MDASH_PAIR),
+            # Spaces before it are matched from the first one only,
+            # otherwise a long run of them is scanned from every space
+            (r'(?<!{0}){0}+[\-|{1}]{0}+(?!\d\b)'.format(ANYSP, NDASH),
+             MDASH_PAIR),
 
             # Same but backwards
-            # It joins non-digit with digit or word
-            (r'(\b\D+){0}+[\-|{1}]{0}+'.format(ANYSP, NDASH),
-             r'\1{0}'.format(MDASH_PAIR)),
+            # It joins non-digit with digit or word.
+            # Same as `(\b\D+)\s+-\s+` to `\1—` which is quadratic
+            # on long texts, because it's tried from every word.
+            # Runs never go over paragraphs, so paragraphs can be
+            # processed apart, see :meth:`typus.core.TypusCore.breaks`
+            (r'(?<![^\d\n])(?<![^\n]\n)(?={2}*?{0}[\-|{1}]{0})'
+             r'{2}[^\d\n]*(?:\n(?!\n)[^\d\n]*)*'.format(ANYSP, NDASH, run),
+             replace),
 
             # Line beginning adds nbsp after dash
             (r'^\-{{1,2}}{0}+'.format(ANYSP),
              r'{0}{1}'.format(MDASH, NBSP)),
 
             # Also mdash can be at the end of the line in poems
-            (r'{0}+\-{{1,2}}{0}*(?=$|<br/?>)'.format(ANYSP),
+            (r'(?<!{0}){0}+\-{{1,2}}{0}*(?=$|<br/?>)'.format(ANYSP),
              r'{0}{1}'.format(NBSP, MDASH)),
 
             # Special case with leading comma
@@ -452,7 +585,9 @@ class EnRuExpressions(BaseExpressions):
         before = re.escape(data.get('before', '') + both)
         after = re.escape(data.get('after', '') + both)
         if before:
-            yield r'{0}+(?=[{1}])'.format(find, before), replace
+            # Starts with the first space only, otherwise it's tried
+            # from every space of a long run
+            yield r'(?<!{0}){0}+(?=[{1}])'.format(find, before), replace
         if after:
             yield r'(?<=[{1}]){0}+'.format(find, after), replace
 
@@ -1,7 +1,10 @@
-from itertools import cycle
-from typing import Match
+from bisect import bisect_right
+from collections import deque
+from itertools import chain, cycle
+from typing import List, Match, Pattern, Tuple
 
 from ..chars import DLQUO, LAQUO, LDQUO, LSQUO, RAQUO, RDQUO, RSQUO
+from ..core import TypusCore
 from ..utils import re_compile
 from .base import BaseProcessor
 
@@ -16,9 +19,28 @@ class BaseQuotes(BaseProcessor):
     >>> from typus import en_typus
     >>> en_typus('Say "what" again!')
     'Say “what” again!'
+
+    Set ``engine = 'stack'`` to pair quotes in a single pass instead of
+    a regex pass per nesting level, so a stray quote doesn't make it scan
+    the rest of the text again. The result is the same for regular cases.
+    Where the regex engine gets confused by adjacent or stray quotes,
+    the stack one pairs the nearest quotes. Its options:
+
+    - ``max_depth`` limits the number of unclosed quotes, the oldest one
+      is left unpaired when it's exceeded,
+    - ``scope = 'paragraph'`` never pairs quotes across paragraphs.
+
+    The regex engine hands texts with quotes nested deeper than
+    ``regex_depth`` levels over to the stack one, otherwise deep nesting
+    would take quadratic time.
     """
 
     loq = roq = leq = req = NotImplemented
+    gating = True
+    engine = 'regex'
+    max_depth = None
+    scope = None
+    regex_depth = 16
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -31,49 +53,269 @@ class BaseQuotes(BaseProcessor):
         quotes = ''.join((LSQUO, RSQUO, LDQUO, RDQUO, DLQUO, LAQUO, RAQUO))
         self.re_normalize = re_compile(r'[{0}]'.format(quotes))
 
+        # Any quote, text without them is left as is
+        self.re_quotes = re_compile(r'[\'"{0}]'.format(quotes))
+
         # Matches nested quotes (with no quotes within)
         # and replaces with odd level quotes
-        self.re_normal = re_compile(
+        normal = (
             # No words before
             r'(?<!\w)'
             # Starts with quote
             r'(["\'])'
             r'(?!\s)'
             # Everything but quote inside
-            r'((?!\1).+?)'
+            r'((?!\1){0}+?)'
             r'(?!\s)'
             # Ends with same quote from the beginning
             r'\1'
             # No words afterwards
             r'(?!\w)'
         )
+        self.re_normal = re_compile(normal.format('.'))
+
+        # Same for texts of a batch, pairs never cross the separator
+        self.re_normal_batch = re_compile(
+            normal.format('[^{0}]'.format(self.separator)))
         self.re_normal_replace = r'{0}\2{1}'.format(self.loq, self.roq)
 
+        # Quotes are normalized, so the rest of typographic ones
+        # can hide unpaired quotes, see :meth:`_normal_subn`
+        self.masks = tuple(zip('"\'', (
+            quote for quote in quotes if quote not in (self.loq, self.roq))))
+
+        # Matches quotes which are left unpaired, but may start a pair
+        self.re_opening = re_compile(r'(?<!\w)["\'](?!\s)')
+
         # Matches with typo quotes
         self.re_nested = re_compile(r'({0}|{1})'.format(self.loq, self.roq))
 
+        # Stack engine tokens: normalized quotes and paragraph breaks
+        if self.engine not in ('regex', 'stack'):
+            raise ValueError('Unknown engine "{0}".'.format(self.engine))
+        breaks = TypusCore.re_paragraph.pattern
+        if self.scope == 'paragraph':
+            self.re_token = re_compile(r'(["\'])|{0}'.format(breaks))
+        elif self.scope is None:
+            self.re_token = re_compile(r'(["\'])')
+        else:
+            raise ValueError('Unknown scope "{0}".'.format(self.scope))
+        self.re_word = re_compile(r'\w')
+        self.re_space = re_compile(r'\s')
+
     def run(self, text: str, **kwargs) -> str:
+        return self.run_other(self._replace(text), **kwargs)
+
+    def run_batch(self, texts, **kwargs):
+        buffer = None
+        if self.engine == 'regex':
+            buffer = self._joined(texts)
+        if buffer is None or (
+                self.gating and not self.re_quotes.search(buffer)):
+            processed = [self._replace(text) for text in texts]
+            return self.run_other_batch(processed, **kwargs)
+
+        # Quotes keep the length, so texts never move in the buffer.
+        # Counts levels of every text, see :meth:`_replace`
+        starts = [0]
+        for text in texts[:-1]:
+            starts.append(starts[-1] + len(text) + 1)
+        levels = [0] * len(texts)
+        touched = set()
+
+        def replace(match: Match):
+            touched.add(bisect_right(starts, match.start()) - 1)
+            return '{0}{1}{2}'.format(self.loq, match.group(2), self.roq)
+
+        normalized = self.re_normalize.sub('\'', buffer)
+        for _ in range(self.regex_depth + 1):
+            normalized, replaced = self._normal_subn(
+                replace, normalized, self.re_normal_batch)
+            if not replaced:
+                break
+            for index in touched:
+                levels[index] += 1
+            touched.clear()
+        else:
+            # Too deep, see :meth:`_replace`
+            processed = [self._replace(text) for text in texts]
+            return self.run_other_batch(processed, **kwargs)
+
+        processed = normalized.split(self.separator)
+        for index, level in enumerate(levels):
+            if level > 1:
+                processed[index] = self._switch_nested(processed[index])
+        return self.run_other_batch(processed, **kwargs)
+
+    def _replace(self, text: str) -> str:
+        if self.gating and not self.re_quotes.search(text):
+            return text
+
         # Normalizes editor's quotes to double one
         normalized = self.re_normalize.sub('\'', text)
+        if self.engine == 'stack':
+            return self._replace_pairs(normalized)
 
         # Replaces normalized quotes with first level ones, starting
         # from inner pairs, moves to sides
-        nested = 0
-        while True:
-            normalized, replaced = self.re_normal.subn(
+        source = normalized
+        for nested in range(self.regex_depth + 1):
+            normalized, replaced = self._normal_subn(
                 self.re_normal_replace, normalized)
             if not replaced:
                 break
-            nested += 1
+        else:
+            # Every level takes a pass over the text,
+            # the stack engine pairs them all in one
+            return self._replace_pairs(source)
 
         # Saves some cpu :)
         # Most cases are about just one level quoting
         if nested < 2:
-            return self.run_other(normalized, **kwargs)
+            return normalized
 
         # At this point all quotes are of odd type, have to fix it
-        switched = self._switch_nested(normalized)
-        return self.run_other(switched, **kwargs)
+        return self._switch_nested(normalized)
+
+    def atomic(self, text, *, complete=True, **kwargs):
+        if self.engine == 'stack':
+            return self._atomic_pairs(text, complete)
+
+        # Quotes are replaced one by one, so indexes never change
+        spans = []
+
+        # Same as :attr:`re_normal_replace`, `match.expand` parses
+        # the template on every call
+        def replace(match: Match):
+            spans.append(match.span())
+            return '{0}{1}{2}'.format(self.loq, match.group(2), self.roq)
+
+        normalized = self.re_normalize.sub('\'', text)
+        for _ in range(self.regex_depth + 1):
+            normalized, replaced = self._normal_subn(replace, normalized)
+            if not replaced:
+                break
+        else:
+            # Too deep, see :meth:`_replace`
+            return self._atomic_pairs(text, complete)
+
+        # Quotes which may be closed in the rest of the text
+        if not complete:
+            spans.extend(
+                (match.start(), len(text))
+                for match in self.re_opening.finditer(normalized))
+        return spans
+
+    def _atomic_pairs(self, text: str, complete: bool) -> List[tuple]:
+        normalized = self.re_normalize.sub('\'', text)
+        pairs, unclosed = self._pairs(normalized)
+        spans = [(start, end + 1) for start, end in pairs]
+        if not complete:
+            spans.extend((start, len(text)) for start in unclosed)
+        return spans
+
+    def _normal_subn(self, replace, text: str,
+                     pattern: Pattern = None) -> Tuple[str, int]:
+        """
+        Runs :attr:`re_normal` or the given pattern over the text.
+        A quote with no closing one afterwards would make it scan the rest
+        of the text, so quotes after the last closing one are hidden
+        for the pass. Replaced quotes keep the length, the result
+        is the same.
+        """
+
+        hidden = []
+        for quote, mask in self.masks:
+            # The closing one has no words afterwards
+            index = len(text)
+            while True:
+                index = text.rfind(quote, 0, index)
+                if index < 0 or not self.re_word.match(text, index + 1):
+                    break
+            if text.find(quote, index + 1) != -1:
+                text = text[:index + 1] + text[index + 1:].replace(quote, mask)
+                hidden.append((quote, mask))
+
+        pattern = self.re_normal if pattern is None else pattern
+        text, replaced = pattern.subn(replace, text)
+        for quote, mask in hidden:
+            text = text.replace(mask, quote)
+        return text, replaced
+
+    def _pairs(self, text: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """
+        Pairs normalized quotes in one pass. Every quote type has its own
+        stack, so the closing quote takes the nearest opening one of the same
+        type. Returns pairs of indexes and indexes of unclosed quotes.
+        """
+
+        stacks = {'"': deque(), '\'': deque()}
+        pairs = []
+        for match in self.re_token.finditer(text):
+            quote = match.group(1)
+            if quote is None:
+                # Paragraph break, unclosed quotes stay as is
+                stacks = {'"': deque(), '\'': deque()}
+                continue
+
+            start = match.start()
+            before = text[start - 1:start]
+            after = text[start + 1:start + 2]
+            stack = stacks[quote]
+
+            # Same rules as :attr:`re_normal` has: no words afterwards
+            # and something within
+            if stack and stack[-1] < start - 1 and not self.re_word.match(
+                    after):
+                pairs.append((stack.pop(), start))
+            elif (after and not self.re_word.match(before)
+                  and not self.re_space.match(after)):
+                stack.append(start)
+                self._limit_depth(stacks)
+            else:
+                # Quote can't start with the same ones left unpaired
+                position = start - 1
+                while stack and stack[-1] == position:
+                    stack.pop()
+                    position -= 1
+
+        unclosed = sorted(chain(*stacks.values()))
+        return pairs, unclosed
+
+    def _limit_depth(self, stacks: dict):
+        """
+        Forgets the oldest unclosed quote if there are too many of them.
+        """
+
+        if self.max_depth is None:
+            return
+        double, single = stacks.values()
+        if len(double) + len(single) > self.max_depth:
+            if not single or (double and double[0] < single[0]):
+                double.popleft()
+            else:
+                single.popleft()
+
+    def _replace_pairs(self, text: str) -> str:
+        """
+        Replaces paired quotes. Every other quote is switched
+        the way :meth:`_switch_nested` does.
+        """
+
+        pairs, _ = self._pairs(text)
+        if not pairs:
+            return text
+
+        quotes = sorted(chain(*(
+            ((start, 0), (end, 1)) for start, end in pairs)))
+        chunks = []
+        last = 0
+        for index, (position, closing) in enumerate(quotes):
+            chunks.append(text[last:position])
+            chunks.append(self.switch[index % 2][closing])
+            last = position + 1
+        chunks.append(text[last:])
+        return ''.join(chunks)
 
     def _switch_nested(self, text: str):
         """
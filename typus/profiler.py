@@ -0,0 +1,270 @@
+from functools import partial
+from threading import local
+from time import perf_counter
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from .core import TypusCore
+from .processors import BaseExpressions
+
+__all__ = ('Profiler', 'Stat', 'Trace', 'Tracer')
+
+
+class Stat(NamedTuple):
+    """
+    Profiling results of a processor or an expressions pass.
+
+    :param name: Processor class name, passes are prefixed with it:
+        ``EnRuExpressions/mdash[0]``
+    :param calls: Number of calls
+    :param time: Seconds spent, processors don't count time of the rest
+        of the chain
+    :param matches: Number of substitutions made by the pass,
+        ``None`` for processors
+    :param bytes_in: Size of texts given in utf-8
+    :param bytes_out: Size of texts returned in utf-8
+    """
+
+    name: str
+    calls: int = 0
+    time: float = 0.0
+    matches: Optional[int] = None
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+class Trace(NamedTuple):
+    """
+    Result of a traced call, see :meth:`typus.core.TypusCore.trace`.
+
+    :param text: Processed text
+    :param cached: ``True`` if the text was taken from the cache,
+        ``False`` if it was processed, ``None`` if it can't be cached
+    :param stages: Stats of processors and expressions passes,
+        empty if the text was taken from the cache
+    """
+
+    text: str
+    cached: Optional[bool]
+    stages: List[Stat]
+
+
+class _Record:
+    __slots__ = Stat._fields[1:]
+
+    def __init__(self, matches: Optional[int] = None):
+        self.calls = self.bytes_in = self.bytes_out = 0
+        self.time = 0.0
+        self.matches = matches
+
+    def stat(self, name: str) -> Stat:
+        return Stat(name, *(getattr(self, field) for field in self.__slots__))
+
+
+def _size(text: str) -> int:
+    return len(text.encode('utf-8', 'surrogatepass'))
+
+
+def _run_each(run: Callable, texts: List[str], **kwargs) -> List[str]:
+    return [run(text, **kwargs) for text in texts]
+
+
+def _subn(expression: Callable) -> Callable:
+    # Expressions are partials of `pattern.sub`, `subn` counts matches too
+    func = getattr(expression, 'func', None)
+    if isinstance(expression, partial) and getattr(
+            func, '__name__', None) == 'sub':
+        return partial(func.__self__.subn, *expression.args,
+                       **expression.keywords)
+    return lambda text: (expression(text), None)
+
+
+class _Recorder:
+    """
+    Keeps records of processors and passes by name.
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._names = {}
+        self._local = local()
+
+    def __getitem__(self, name: str) -> Stat:
+        return self._records[name].stat(name)
+
+    def stats(self, sort: str = 'time') -> List[Stat]:
+        """
+        Returns results sorted by the given :class:`Stat` field,
+        largest first.
+        """
+
+        stats = [record.stat(name) for name, record in self._records.items()]
+        return sorted(
+            stats, key=lambda stat: getattr(stat, sort) or 0, reverse=True)
+
+    def _name(self, processor) -> str:
+        try:
+            return self._names[processor]
+        except KeyError:
+            pass
+
+        # Same processors may be chained more than once
+        name = unique = type(processor).__name__
+        index = 1
+        while unique in self._records:
+            index += 1
+            unique = '{0}#{1}'.format(name, index)
+        self._names[processor] = unique
+        self._records[unique] = _Record()
+        return unique
+
+    def _measure(self, name: str, run: Callable, text: str,
+                 kwargs: dict) -> str:
+        # Time of the rest of the chain is subtracted
+        state = self._local
+        outer = getattr(state, 'nested', 0.0)
+        state.nested = 0.0
+        start = perf_counter()
+        try:
+            result = run(text, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            record = self._records[name]
+            record.time += elapsed - state.nested
+            state.nested = outer + elapsed
+        record.calls += 1
+        record.bytes_in += _size(text)
+        record.bytes_out += _size(result)
+        return result
+
+    def _wrap_passes(self, name: str, processor: BaseExpressions,
+                     compiled: Iterable[Callable]) -> tuple:
+        return tuple(
+            self._wrap_pass('{0}/{1}'.format(name, pass_name), pass_)
+            for pass_name, pass_ in zip(processor.names, compiled)
+        )
+
+    def _wrap_pass(self, name: str, expression: Callable) -> Callable:
+        self._records.setdefault(name, _Record(0))
+        subn = _subn(expression)
+
+        def wrapper(text: str) -> str:
+            start = perf_counter()
+            result, matches = subn(text)
+            record = self._records[name]
+            record.time += perf_counter() - start
+            record.calls += 1
+            if matches is None:
+                record.matches = None
+            elif record.matches is not None:
+                record.matches += matches
+            record.bytes_in += _size(text)
+            record.bytes_out += _size(result)
+            return result
+        return wrapper
+
+
+class Tracer(_Recorder):
+    """
+    Records a single call, see :meth:`typus.core.TypusCore.trace`.
+    It's passed to processors along with other call settings,
+    so unlike :class:`Profiler` it measures nothing but that call.
+    """
+
+    # Calls which get it aren't cached
+    __hash__ = None
+
+    def run(self, processor, text: str, **kwargs) -> str:
+        """
+        Runs the processor and records it.
+        """
+
+        return self._measure(
+            self._name(processor), processor.run, text, kwargs)
+
+    def passes(self, processor: BaseExpressions,
+               compiled: Iterable[Callable]) -> tuple:
+        """
+        Returns expressions passes which record themselves.
+        """
+
+        return self._wrap_passes(self._name(processor), processor, compiled)
+
+
+class Profiler(_Recorder):
+    """
+    Records time, calls, matches and text sizes of every processor of
+    the typus and every pass of its expressions. Processors are
+    instrumented on start only, so there is no overhead otherwise.
+    The typus is instrumented for every caller, threads included,
+    till the profiler is stopped.
+
+    >>> from typus import en_typus
+    >>> with en_typus.profile() as profiler:
+    ...     en_typus('"foo" -- bar')
+    '“foo” — bar'
+    >>> profiler['EnQuotes'].calls
+    1
+    >>> profiler['EnRuExpressions/mdash[0]'].matches
+    1
+    >>> print(profiler.report())  # doctest: +ELLIPSIS
+    name ... calls ... time, ms ... matches ... bytes in ... bytes out
+    ...
+    """
+
+    def __init__(self, typus: TypusCore):
+        super().__init__()
+        self.typus = typus
+        self._patched = []
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        for processor in self.typus.procs:
+            name = self._name(processor)
+            run = self._wrap_run(name, processor.run)
+            self._patch(processor, 'run', run)
+
+            # Batches run text by text, so every text is measured
+            self._patch(processor, 'run_batch', partial(_run_each, run))
+
+            if isinstance(processor, BaseExpressions):
+                self._patch(processor, 'compiled', self._wrap_passes(
+                    name, processor, processor.compiled))
+
+    def stop(self):
+        for processor, attr, value in reversed(self._patched):
+            if value is None:
+                delattr(processor, attr)
+            else:
+                setattr(processor, attr, value)
+        self._patched = []
+
+    def reset(self):
+        for name, record in self._records.items():
+            self._records[name] = _Record(
+                None if record.matches is None else 0)
+
+    def report(self, sort: str = 'time') -> str:
+        lines = ['{0:50} {1:>8} {2:>10} {3:>8} {4:>10} {5:>10}'.format(
+            'name', 'calls', 'time, ms', 'matches', 'bytes in', 'bytes out')]
+        lines.extend(
+            '{0:50} {1:8} {2:10.3f} {3:>8} {4:10} {5:10}'.format(
+                stat.name, stat.calls, stat.time * 1000,
+                '-' if stat.matches is None else stat.matches,
+                stat.bytes_in, stat.bytes_out)
+            for stat in self.stats(sort))
+        return '\n'.join(lines)
+
+    def _patch(self, processor, attr: str, value):
+        self._patched.append((processor, attr, vars(processor).get(attr)))
+        setattr(processor, attr, value)
+
+    def _wrap_run(self, name: str, run: Callable) -> Callable:
+        def wrapper(text: str, **kwargs) -> str:
+            return self._measure(name, run, text, kwargs)
+        return wrapper
@@ -0,0 +1,101 @@
+"""
+Process-wide registry of compiled patterns and rules. Typus instances,
+subclasses included, share equal patterns and compiled expressions instead
+of building their own copies.
+"""
+
+import re
+from threading import Lock
+from types import FunctionType
+from typing import Any, Callable, Hashable, Optional
+
+__all__ = ('Registry', 'registry')
+
+Pattern = type(re.compile(''))
+
+
+class Unhashable(Exception):
+    pass
+
+
+def _key(value: Any) -> Hashable:
+    if value is None or isinstance(value, (str, type)):
+        key = value
+    elif isinstance(value, (bytes, int, float)):
+        # Keeps 1, 1.0 and True apart
+        key = type(value), value
+    elif isinstance(value, (list, tuple)):
+        key = tuple(map(_key, value))
+    elif isinstance(value, (set, frozenset)):
+        key = frozenset(map(_key, value))
+    elif isinstance(value, dict):
+        # Dictionary type matters, see :class:`typus.utils.idict`
+        key = type(value), tuple((k, _key(v)) for k, v in value.items())
+    elif isinstance(value, Pattern):
+        key = value.pattern, value.flags
+    elif isinstance(value, FunctionType):
+        # Functions made by the same code of equal values work the same
+        closure = tuple(cell.cell_contents for cell in value.__closure__ or ())
+        key = (value.__code__, _key(value.__defaults__),
+               _key(value.__kwdefaults__), _key(closure))
+    else:
+        raise Unhashable(type(value).__name__)
+    return key
+
+
+class Registry:
+    """
+    Stores values built by the first caller and returns them to the rest.
+
+    >>> from typus.registry import registry
+    >>> registry.compile('[a-z]', 0) is registry.compile('[a-z]', 0)
+    True
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def key(*values) -> Optional[Hashable]:
+        """
+        Returns a hashable key of the values or ``None`` if it can't be
+        built. Functions are compared by their code and variables they use,
+        so closures made with the same data are equal.
+        """
+
+        try:
+            return _key(values)
+        except Unhashable:
+            return None
+
+    def get(self, key: Optional[Hashable], build: Callable[[], Any]) -> Any:
+        """
+        Returns the value for the key, calls ``build`` on the first call.
+        Never stores anything if the key is ``None``.
+        """
+
+        if key is None:
+            return build()
+        try:
+            return self._data[key]
+        except KeyError:
+            pass
+
+        value = build()
+        with self._lock:
+            return self._data.setdefault(key, value)
+
+    def compile(self, pattern: str, flags: int) -> 're.Pattern':
+        return self.get(
+            ('pattern', pattern, flags), lambda: re.compile(pattern, flags))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+registry = Registry()
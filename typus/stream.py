@@ -0,0 +1,180 @@
+from functools import partial
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+__all__ = ('Stream', 'StreamWriter')
+
+
+class Stream:
+    r"""
+    Processes text given in chunks. Chunks are buffered until the buffer
+    reaches a half of the ``window``, then everything up to the end of
+    the last safe paragraph break (see :meth:`typus.core.TypusCore.breaks`)
+    is processed and yielded. If there is none, breaks are looked for again
+    once the buffer grows by an eighth of the ``window``. If there is no
+    safe break within the ``window`` the buffer is split at the last
+    paragraph break, line break or space, so memory stays bounded.
+
+    :param typus: :class:`typus.core.TypusCore` instance
+    :param chunks: Iterable of strings or a file-like object
+    :param int window: Maximum buffer size
+    :param kwargs: Optional settings passed to typus
+
+    >>> from typus import en_typus
+    >>> from typus.stream import Stream
+    >>> chunks = ['"foo"\n', '\nbar', ' (c)\n\n', '"baz"']
+    >>> stream = Stream(en_typus, chunks, window=16)
+    >>> list(stream), stream.peak
+    (['“foo”', '\n\nbar ©', '\n\n“baz”'], 14)
+    """
+
+    delimiter = '\n\n'
+    read_size = 2 ** 16
+
+    def __init__(self, typus, chunks: Union[Iterable[str], IO[str]],
+                 window: int = 2 ** 20, **kwargs):
+        if hasattr(chunks, 'read'):
+            chunks = iter(partial(chunks.read, self.read_size), '')
+
+        self.typus = typus
+        self.chunks = chunks
+        self.window = window
+        self.kwargs = typus.prepare(kwargs)
+        self.peak = 0
+
+        self._buffer = []
+        self._size = 0
+
+        # Buffer size to look for breaks at, see :meth:`feed`
+        self._scan = window // 2
+
+        # Spaces after the last yielded part, ``None`` till the first one
+        self._pending = None
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.chunks:
+            yield from self.feed(chunk)
+        yield from self.flush()
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Adds chunk to the buffer and returns processed parts if any.
+        """
+
+        self._buffer.append(chunk)
+        self._size += len(chunk)
+        self.peak = max(self.peak, self._size)
+        if self._size < self._scan:
+            return []
+
+        buffer = ''.join(self._buffer)
+        split = self._split(buffer)
+        if not split:
+            # Looking for breaks on every chunk would scan the buffer
+            # again and again
+            self._buffer = [buffer]
+            self._scan = min(
+                self._size + max(self.window // 8, 1), self.window)
+            return []
+
+        start, end, delimiter = split
+        head, tail = buffer[:start], buffer[end:]
+        self._buffer = [tail]
+        self._size = len(tail)
+        self._scan = self.window // 2
+        return self._process(head, delimiter)
+
+    def flush(self) -> List[str]:
+        """
+        Processes the rest of the buffer.
+        """
+
+        buffer = ''.join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self._scan = self.window // 2
+        return self._process(buffer.rstrip(), '')
+
+    def _split(self, buffer: str) -> Optional[Tuple[int, int, str]]:
+        """
+        Returns the span to split the buffer at and the delimiter
+        to put between processed parts.
+        """
+
+        # Parts keep breaks after them, see
+        # :meth:`typus.core.TypusCore.process_part`. A break followed
+        # by spaces only may go on in the next chunk
+        breaks = self.typus.breaks(buffer, complete=False, **self.kwargs)
+        for _, end in reversed(breaks):
+            if buffer[end:].strip():
+                return end, end, ''
+        if len(buffer) < self.window:
+            return None
+
+        # Forced split. The last character is skipped, because
+        # the next chunk may continue the break
+        paragraphs = list(self.typus.re_paragraph.finditer(buffer))
+        if paragraphs and paragraphs[-1].end() < len(buffer):
+            return paragraphs[-1].span() + (self.delimiter, )
+        for separator in ('\n', ' '):
+            index = buffer.rfind(separator, 0, len(buffer) - 1)
+            if index > 0:
+                return index, index + 1, separator
+        return len(buffer), len(buffer), ''
+
+    def _process(self, text: str, delimiter: str) -> List[str]:
+        if self._pending is None:
+            # Spaces at the start of the text are stripped
+            text = text.lstrip()
+        processed = self.typus.process_part(text, **self.kwargs)
+
+        # Spaces at the end are put when something follows them
+        content = processed.rstrip()
+        if not content:
+            if self._pending is not None:
+                self._pending += delimiter or processed
+            return []
+
+        # Forced splits put the delimiter instead
+        processed, self._pending = (
+            (self._pending or '') + content,
+            delimiter or processed[len(content):])
+        return [processed]
+
+
+class StreamWriter:
+    r"""
+    File-like wrapper which writes processed text into the ``file``.
+    See :class:`Stream` for details.
+
+    >>> import io
+    >>> from typus import en_typus
+    >>> from typus.stream import StreamWriter
+    >>> output = io.StringIO()
+    >>> with StreamWriter(en_typus, output) as writer:
+    ...     writer.write('"foo"\n\n')
+    ...     writer.write('bar (c)')
+    >>> output.getvalue()
+    '“foo”\n\nbar ©'
+    """
+
+    def __init__(self, typus, file: IO[str], window: int = 2 ** 20,
+                 **kwargs):
+        self.file = file
+        self.stream = Stream(typus, (), window=window, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def peak(self) -> int:
+        return self.stream.peak
+
+    def write(self, chunk: str):
+        self.file.writelines(self.stream.feed(chunk))
+
+    def close(self):
+        self.file.writelines(self.stream.flush())
+        self.file.flush()
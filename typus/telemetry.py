@@ -0,0 +1,217 @@
+import random
+from collections import deque
+from threading import Lock
+from time import perf_counter, time
+from typing import Dict, List
+
+from .core import TypusCore
+
+__all__ = ('Telemetry', 'render', 'snapshot', 'telemetries')
+
+INF = float('inf')
+
+# Registered telemetries by name, see :func:`snapshot` and :func:`render`
+telemetries = {}
+
+
+class Telemetry:
+    """
+    Always-on telemetry of :class:`typus.core.TypusCore` calls. Every
+    call is counted in the latency histogram of its input size and in
+    cache hits and misses. Calls slower than ``slow`` seconds are kept
+    in a ring buffer of ``capacity`` entries.
+
+    A ``sample_rate`` share of calls is traced with
+    :meth:`typus.core.TypusCore.trace`, their slow entries also have
+    timing per processor and expressions pass and the share of passes
+    skipped by gating. Tracing makes calls on short texts several times
+    slower, while counters cost a few microseconds per call, so keep
+    ``sample_rate`` low on hot paths.
+
+    :param str name: Name to register with, ``None`` doesn't register
+    :param float sample_rate: Share of calls to trace, from 0 to 1
+    :param float slow: Latency in seconds to keep the input from
+    :param int capacity: Number of slow inputs to keep
+
+    >>> from typus import EnTypus
+    >>> from typus.telemetry import Telemetry
+    >>> telemetry = Telemetry(slow=0, sample_rate=1)
+    >>> en_typus = EnTypus(telemetry=telemetry)
+    >>> en_typus('"foo"')
+    '“foo”'
+    >>> telemetry.snapshot()['calls']
+    1
+    >>> entry, = telemetry.slow_inputs()
+    >>> entry['text']
+    '"foo"'
+    >>> sorted(stage['name'] for stage in entry['stages'])[:2]
+    ['EnQuotes', 'EnRuExpressions']
+    """
+
+    # Upper bounds of input size in characters
+    sizes = (2 ** 6, 2 ** 8, 2 ** 10, 2 ** 12, 2 ** 14, 2 ** 16, INF)
+
+    # Upper bounds of latency in seconds
+    latencies = (
+        1e-5, 3e-5, 1e-4, 3e-4, 1e-3, 3e-3, 1e-2, 3e-2, 0.1, 0.3, 1.0, INF)
+
+    def __init__(self, name: str = None, *, sample_rate: float = 0.01,
+                 slow: float = 0.05, capacity: int = 64):
+        self.name = name
+        self.sample_rate = sample_rate
+        self.slow = slow
+        self.capacity = capacity
+        self._lock = Lock()
+        self.reset()
+        if name is not None:
+            telemetries[name] = self
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.cache_hits = self.cache_misses = 0
+            self.histograms = {
+                size: [0] * len(self.latencies) for size in self.sizes}
+            self.totals = dict.fromkeys(self.sizes, 0.0)
+            self._slow = deque(maxlen=self.capacity)
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def observe(self, typus: TypusCore, source: str, debug: bool,
+                kwargs: dict) -> str:
+        """
+        Calls the typus and records the call.
+        """
+
+        stages = self.sampled()
+        start = perf_counter()
+        trace = typus.trace(source, debug=debug, stages=stages, **kwargs)
+        elapsed = perf_counter() - start
+
+        size = next(x for x in self.sizes if len(source) <= x)
+        latency = next(
+            i for i, x in enumerate(self.latencies) if elapsed <= x)
+        with self._lock:
+            self.calls += 1
+            self.histograms[size][latency] += 1
+            self.totals[size] += elapsed
+            if trace.cached:
+                self.cache_hits += 1
+            elif trace.cached is not None:
+                self.cache_misses += 1
+            if elapsed >= self.slow:
+                self._slow.append((time(), elapsed, source, trace))
+        return trace.text
+
+    def slow_inputs(self) -> List[dict]:
+        """
+        Returns slow inputs, the slowest first. Every entry has
+        ``stages`` with timing of processors and expressions passes,
+        empty if the call wasn't traced or the result was taken
+        from the cache.
+        """
+
+        with self._lock:
+            entries = list(self._slow)
+
+        results = []
+        for when, elapsed, source, trace in entries:
+            # Passes skipped by gating are never called
+            passes = [stage for stage in trace.stages if '/' in stage.name]
+            results.append({
+                'time': when,
+                'latency': elapsed,
+                'size': len(source),
+                'text': source,
+                'cached': trace.cached,
+                'gated': _rate(
+                    sum(not stage.calls for stage in passes),
+                    sum(bool(stage.calls) for stage in passes)),
+                'stages': [
+                    stage._asdict() for stage in trace.stages if stage.calls],
+            })
+        return sorted(results, key=lambda x: x['latency'], reverse=True)
+
+    def snapshot(self) -> dict:
+        """
+        Returns all the data as a json serializable dictionary.
+        """
+
+        with self._lock:
+            histograms = {
+                _label(size): {
+                    _label(bound): count
+                    for bound, count in zip(self.latencies, counts)
+                }
+                for size, counts in self.histograms.items()
+            }
+            data = {
+                'name': self.name,
+                'sample_rate': self.sample_rate,
+                'calls': self.calls,
+                'latency': histograms,
+                'latency_sum': {
+                    _label(size): total for size, total in self.totals.items()
+                },
+                'cache': {
+                    'hits': self.cache_hits,
+                    'misses': self.cache_misses,
+                    'hit_rate': _rate(self.cache_hits, self.cache_misses),
+                },
+            }
+        data['slow'] = self.slow_inputs()
+        return data
+
+    def render(self) -> str:
+        """
+        Returns metrics in Prometheus text format.
+        """
+
+        name = self.name or ''
+        lines = []
+        with self._lock:
+            for size, counts in self.histograms.items():
+                labels = 'typus="{0}",size="{1}"'.format(name, _label(size))
+                cumulative = 0
+                for bound, count in zip(self.latencies, counts):
+                    cumulative += count
+                    lines.append(
+                        'typus_latency_seconds_bucket{{{0},le="{1}"}} {2}'
+                        .format(labels, _label(bound), cumulative))
+                lines.append('typus_latency_seconds_sum{{{0}}} {1}'.format(
+                    labels, self.totals[size]))
+                lines.append('typus_latency_seconds_count{{{0}}} {1}'.format(
+                    labels, cumulative))
+            for result, value in (('hit', self.cache_hits),
+                                  ('miss', self.cache_misses)):
+                lines.append(
+                    'typus_cache_total{{typus="{0}",result="{1}"}} {2}'
+                    .format(name, result, value))
+        return ''.join(line + '\n' for line in lines)
+
+
+def _label(bound: float) -> str:
+    return '+Inf' if bound == INF else '{0:g}'.format(bound)
+
+
+def _rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def snapshot() -> Dict[str, dict]:
+    """
+    Returns snapshots of all registered telemetries.
+    """
+
+    return {
+        name: telemetry.snapshot() for name, telemetry in telemetries.items()}
+
+
+def render() -> str:
+    """
+    Returns all registered telemetries in Prometheus text format.
+    """
+
+    return ''.join(telemetry.render() for telemetry in telemetries.values())
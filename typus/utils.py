@@ -4,11 +4,14 @@ import re
 from functools import wraps
 from typing import Callable, Iterable, List
 
+from .registry import registry
+
 __all__ = (
     'RE_SCASE',
     'RE_ICASE',
     'doc_map',
     'idict',
+    'lazy_attribute',
     'map_choices',
     're_choices',
     're_compile',
@@ -24,6 +27,7 @@ def re_compile(pattern: str, flags: int = RE_ICASE):
     """
     A shortcut to compile regex with predefined flags:
     :const:`re.I`, :const:`re.U`, :const:`re.M`, :const:`re.S`.
+    Patterns are shared process-wide, see :mod:`typus.registry`.
 
     :param str pattern: A string to compile pattern from.
     :param int flags: Python :mod:`re` module flags.
@@ -36,7 +40,7 @@ def re_compile(pattern: str, flags: int = RE_ICASE):
     False
     """
 
-    return re.compile(pattern, flags)
+    return registry.compile(pattern, flags)
 
 
 def re_choices(choices: Iterable[str], group: str = r'({})') -> str:
@@ -78,6 +82,37 @@ class idict(dict):
         return super().__getitem__(key.lower())
 
 
+class lazy_attribute:
+    """
+    Computes the attribute on first access and stores it in the instance,
+    like :func:`functools.cached_property` does in newer Pythons.
+    Stored value can be set or deleted as any other attribute.
+
+    >>> class Foo:
+    ...     @lazy_attribute
+    ...     def bar(self):
+    ...         print('computed')
+    ...         return 1
+    ...
+    >>> foo = Foo()
+    >>> foo.bar
+    computed
+    1
+    >>> foo.bar
+    1
+    """
+
+    def __init__(self, func: Callable):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.func.__name__] = self.func(instance)
+        return value
+
+
 def map_choices(data: dict, group: str = r'({})', dict_class=idict) -> tuple:
     """
     :class:`typus.processors.Expressions` helper.
@@ -106,6 +141,9 @@ def map_choices(data: dict, group: str = r'({})', dict_class=idict) -> tuple:
 
     def replace(match):
         return str(options[match.group()])
+
+    # Lets expressions engine know what can be put
+    replace.outputs = tuple(map(str, options.values()))
     return pattern, replace
 
 
@@ -0,0 +1,331 @@
+"""
+Dependency-free ASGI application with a WSGI shim, to run typus
+as a service. Serve an instance of :class:`App` with any ASGI server,
+or its ``wsgi`` method with a WSGI one::
+
+    $ uvicorn --factory typus.web:App
+
+Endpoints:
+
+- ``POST /en``, ``POST /ru`` take UTF-8 text and return it processed,
+  ``debug`` and ``escape_phrase`` query arguments are passed to typus,
+- ``POST /en/batch``, ``POST /ru/batch`` take json
+  ``{"texts": [...], "debug": false, "escape_phrases": [...]}``
+  and return ``{"texts": [...]}``,
+- ``GET /metrics`` returns telemetry in Prometheus text format,
+  see :class:`typus.telemetry.Telemetry`.
+"""
+
+import asyncio
+import json
+from functools import partial
+from typing import List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qs
+
+from . import EnTypus, RuTypus
+from .aio import Coalescer
+from .cache import ResultCache
+from .pool import TypusPool
+from .telemetry import Telemetry
+
+__all__ = ('App', )
+
+STATUSES = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+}
+
+
+class Response(NamedTuple):
+    status: int
+    content_type: str
+    body: bytes
+
+
+class Job(NamedTuple):
+    lang: str
+    texts: List[str]
+    kwargs: dict
+    batch: bool
+
+
+def text_response(status: int, text: str) -> Response:
+    return Response(status, 'text/plain; charset=utf-8', text.encode('utf-8'))
+
+
+class App:
+    """
+    Runs :attr:`typuses` behind http endpoints. Concurrent single calls
+    are collected into micro-batches by :class:`typus.aio.Coalescer`,
+    batches run off the event loop, both on a
+    :class:`typus.pool.TypusPool` if ``executor`` is given.
+
+    :param cache: Results cache shared by typuses, a new one by default
+    :param str executor: ``thread``, ``process`` or ``None`` to run
+        on loop's default executor, see :class:`typus.pool.TypusPool`
+    :param int workers: Number of pool workers
+
+    Limits are set with attributes: ``max_body_size`` of a request
+    in bytes, ``max_batch`` number of texts and telemetry's
+    ``sample_rate``, see :class:`typus.telemetry.Telemetry`.
+
+    >>> from typus.web import App
+    >>> app = App()
+    >>> response = app.handle('POST', '/en', '', b'"foo" (c)')
+    >>> response.status, response.body.decode('utf-8')
+    (200, '“foo” ©')
+
+    .. note::
+        Process workers build their own typus, so the cache and
+        telemetry of the app see thread and default executor calls only.
+    """
+
+    typuses = {'en': EnTypus, 'ru': RuTypus}
+    max_body_size = 2 ** 20
+    max_batch = 1024
+    sample_rate = 0.01
+
+    def __init__(self, *, cache: ResultCache = None, executor: str = None,
+                 workers: int = None):
+        self.cache = ResultCache() if cache is None else cache
+        self.telemetries = {
+            lang: Telemetry(lang, sample_rate=self.sample_rate)
+            for lang in self.typuses
+        }
+        self.instances = {
+            lang: typus(cache=self.cache, telemetry=self.telemetries[lang])
+            for lang, typus in self.typuses.items()
+        }
+        self.pools = {}
+        if executor is not None:
+            self.pools = {
+                lang: TypusPool(typus, executor=executor, workers=workers)
+                for lang, typus in self.instances.items()
+            }
+        self.coalescers = {}
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+    async def aclose(self):
+        for coalescer in self.coalescers.values():
+            await coalescer.close()
+        self.coalescers = {}
+        self.close()
+
+    def handle(self, method: str, path: str, query: str,
+               body: bytes) -> Response:
+        """
+        Handles a request synchronously, see :meth:`wsgi`.
+        """
+
+        job = self._prepare(method, path, query, body)
+        if isinstance(job, Response):
+            return job
+        run = self.pools.get(job.lang) or self.instances[job.lang]
+        return self._respond(job, run.map(job.texts, **job.kwargs))
+
+    async def ahandle(self, method: str, path: str, query: str,
+                      body: bytes) -> Response:
+        """
+        Handles a request off the event loop, see :meth:`__call__`.
+        """
+
+        job = self._prepare(method, path, query, body)
+        if isinstance(job, Response):
+            return job
+
+        if job.batch:
+            run = self.pools.get(job.lang) or self.instances[job.lang]
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(
+                None, partial(run.map, job.texts, **job.kwargs))
+        else:
+            coalescer = self._coalescer(job.lang)
+            results = [await coalescer(job.texts[0], **job.kwargs)]
+        return self._respond(job, results)
+
+    async def __call__(self, scope: dict, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+
+        body = await self._receive(scope, receive)
+        if isinstance(body, Response):
+            response = body
+        else:
+            response = await self.ahandle(
+                scope['method'], scope['path'],
+                scope.get('query_string', b'').decode('latin-1'), body)
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': [
+                (b'content-type', response.content_type.encode('latin-1')),
+                (b'content-length', str(len(response.body)).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': response.body})
+
+    def wsgi(self, environ: dict, start_response) -> List[bytes]:
+        """
+        WSGI application of the same endpoints.
+        """
+
+        try:
+            size = int(environ.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            size = 0
+        if size > self.max_body_size:
+            response = self._too_large()
+        else:
+            body = environ['wsgi.input'].read(size) if size else b''
+            response = self.handle(
+                environ['REQUEST_METHOD'], environ.get('PATH_INFO', ''),
+                environ.get('QUERY_STRING', ''), body)
+
+        start_response(
+            '{0} {1}'.format(response.status, STATUSES[response.status]), [
+                ('Content-Type', response.content_type),
+                ('Content-Length', str(len(response.body))),
+            ])
+        return [response.body]
+
+    def metrics(self) -> str:
+        """
+        Returns telemetry of typuses in Prometheus text format.
+        """
+
+        return ''.join(
+            telemetry.render() for telemetry in self.telemetries.values())
+
+    def _prepare(self, method: str, path: str, query: str,
+                 body: bytes) -> Union[Job, Response]:
+        """
+        Validates the request and returns texts to process
+        or the response right away.
+        """
+
+        route = self._route(path)
+        if route is None:
+            return text_response(404, 'Not found.')
+
+        lang, batch = route
+        expected = 'GET' if lang is None else 'POST'
+        if method != expected:
+            return text_response(405, 'Use {0}.'.format(expected))
+        if lang is None:
+            return Response(
+                200, 'text/plain; version=0.0.4; charset=utf-8',
+                self.metrics().encode('utf-8'))
+
+        try:
+            text = body.decode('utf-8')
+        except UnicodeDecodeError:
+            return text_response(400, 'Body must be UTF-8.')
+        if batch:
+            return self._batch(lang, text)
+
+        params = parse_qs(query)
+        kwargs = {'debug': params.get('debug') in (['1'], ['true'])}
+        if 'escape_phrase' in params:
+            kwargs['escape_phrases'] = params['escape_phrase']
+        return Job(lang, [text], kwargs, False)
+
+    def _route(self, path: str) -> Optional[Tuple[Optional[str], bool]]:
+        # Language and batch flag, no language for metrics
+        parts = path.strip('/').split('/')
+        if parts == ['metrics']:
+            return None, False
+        if parts[0] not in self.instances or len(parts) > 2:
+            return None
+        if len(parts) == 2 and parts[1] != 'batch':
+            return None
+        return parts[0], len(parts) == 2
+
+    def _batch(self, lang: str, text: str) -> Union[Job, Response]:
+        try:
+            texts, kwargs = self._load_batch(text)
+        except ValueError as exc:
+            return text_response(400, str(exc))
+        if len(texts) > self.max_batch:
+            return text_response(413, 'Batch exceeds {0} texts.'.format(
+                self.max_batch))
+        return Job(lang, texts, kwargs, True)
+
+    @staticmethod
+    def _load_batch(text: str) -> Tuple[List[str], dict]:
+        data = json.loads(text)
+        if not isinstance(data, dict) or not isinstance(
+                data.get('texts'), list):
+            raise ValueError('Body must be an object with "texts" list.')
+
+        texts = data['texts']
+        phrases = data.get('escape_phrases', [])
+        if not isinstance(phrases, list):
+            raise ValueError('Phrases must be a list.')
+        if not all(isinstance(x, str) for x in texts + phrases):
+            raise ValueError('Texts and phrases must be strings.')
+
+        kwargs = {'debug': data.get('debug') is True}
+        if phrases:
+            kwargs['escape_phrases'] = phrases
+        return texts, kwargs
+
+    @staticmethod
+    def _respond(job: Job, results: List[str]) -> Response:
+        if not job.batch:
+            return text_response(200, results[0])
+        body = json.dumps({'texts': results}, ensure_ascii=False)
+        return Response(
+            200, 'application/json; charset=utf-8', body.encode('utf-8'))
+
+    def _too_large(self) -> Response:
+        return text_response(413, 'Body exceeds {0} bytes.'.format(
+            self.max_body_size))
+
+    def _coalescer(self, lang: str) -> Coalescer:
+        # Created on the first call, so it runs on the server loop
+        try:
+            return self.coalescers[lang]
+        except KeyError:
+            coalescer = self.coalescers[lang] = Coalescer(
+                self.instances[lang], self.pools.get(lang))
+            return coalescer
+
+    async def _receive(self, scope: dict,
+                       receive) -> Union[bytes, Response]:
+        headers = dict(scope.get('headers', ()))
+        try:
+            size = int(headers.get(b'content-length', 0))
+        except ValueError:
+            size = 0
+        if size > self.max_body_size:
+            return self._too_large()
+
+        chunks = []
+        received = 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            received += len(chunk)
+            if received > self.max_body_size:
+                return self._too_large()
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return